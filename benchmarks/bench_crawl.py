@@ -0,0 +1,140 @@
+"""Đo tốc độ lấy link bài viết của từng biến thể crawler trên feed giả lập cục bộ.
+
+    python -m benchmarks.bench_crawl --posts 300 --latency 300 --output crawl.json
+    python -m benchmarks.bench_crawl --variants observer,http --submit-mode single
+
+Mỗi biến thể gọi đúng hàm crawl của repo (``get_post_links_from_group`` với
+chiến lược tìm link tương ứng trong ``rpacrawl.strategies``, hoặc
+``crawl_group_http``) trên fixture group feed (cuộn vô hạn, ``role="article"``,
+link ``/groups/<id>/posts/<id>``) và gửi link lên ``api_bai_viet.php`` giả lập
+qua ``LinkSubmitter``. Kết quả cho mỗi biến thể: số bài/giây (tính cả thời gian
+gửi hết hàng đợi), số lệnh WebDriver và số request API trên mỗi bài, và RSS
+đỉnh của chromedriver + Chrome (chỉ đo được trên Linux).
+
+So sánh kết quả JSON giữa các commit để phát hiện thay đổi làm chậm crawler.
+Biến thể trình duyệt không mở được Chrome (máy không có Chrome/chromedriver)
+được ghi kèm khóa ``error`` thay vì số đo, các biến thể khác vẫn chạy tiếp.
+"""
+
+import os
+import time
+import logging
+import argparse
+
+from selenium.common.exceptions import WebDriverException
+
+from benchmarks.common import ApiStubServer, FixtureServer, MemorySampler, count_webdriver_calls, emit, make_driver
+from rpa_browser import LeanProfile
+from rpa_http_crawl import HttpSession, crawl_group_http
+from rpa_scroll import AdaptiveScroller
+from rpa_submit import LinkSubmitter
+from rpacrawl.crawler import get_post_links_from_group
+
+# tên -> tham số cho get_post_links_from_group (None: backend HTTP/mbasic)
+VARIANTS = {
+    "anchors": {"strategy": "anchors"},
+    "containers": {"strategy": "containers"},
+    "js": {"strategy": "js"},
+    "observer": {"strategy": "observer"},
+    "observer_prune": {"strategy": "observer", "prune_dom": True},
+    "observer_lean": {"strategy": "observer", "lean": True},
+    "http": None,
+}
+
+
+def run_browser(name, options, args, fixture, api):
+    options = dict(options)
+    driver = make_driver(lean=LeanProfile() if options.pop("lean", False) else None)
+    try:
+        group_url = (
+            f"{fixture.base_url}/group_feed.html?total={args.posts}&latency={args.latency}"
+            f"&batch={args.batch}&images={0 if args.no_images else 1}"
+        )
+        submitter = make_submitter(api, args)
+        calls = count_webdriver_calls(driver)
+        started = time.monotonic()
+        with MemorySampler(driver) as memory:
+            posts = get_post_links_from_group(
+                driver,
+                group_url,
+                args.posts,
+                submitter,
+                scroller=AdaptiveScroller(min_delay=0, max_wait=2),
+                **options,
+            )
+            submitter.close()
+        elapsed = time.monotonic() - started
+        return result(name, posts, elapsed, calls[0], api, memory.peak_mb)
+    finally:
+        driver.quit()
+
+
+def run_http(name, args, fixture, api):
+    fixture.mbasic_total = args.posts
+    fixture.mbasic_latency = args.latency / 1000
+    os.environ["MBASIC_BASE"] = f"{fixture.base_url}/mbasic"
+    session = HttpSession([{"name": "c_user", "value": "1", "domain": "127.0.0.1"}])
+    try:
+        submitter = make_submitter(api, args)
+        started = time.monotonic()
+        posts = crawl_group_http(session, "https://www.facebook.com/groups/fixture", args.posts, submitter, page_delay=0)
+        submitter.close()
+        return result(name, posts, time.monotonic() - started, 0, api, None)
+    finally:
+        session.quit()
+
+
+def make_submitter(api, args):
+    return LinkSubmitter(api.api_url, batch_size=args.submit_batch, bulk=args.submit_mode == "bulk")
+
+
+def result(name, posts, elapsed, webdriver_calls, api, peak_mb):
+    per_post = max(posts, 1)
+    return {
+        "variant": name,
+        "posts": posts,
+        "seconds": round(elapsed, 2),
+        "posts_per_sec": round(posts / elapsed, 2) if elapsed else None,
+        "webdriver_calls": webdriver_calls,
+        "webdriver_calls_per_post": round(webdriver_calls / per_post, 3),
+        "api_calls": api.api_calls,
+        "api_calls_per_post": round(api.api_calls / per_post, 3),
+        "peak_chrome_mb": peak_mb,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--variants", default=",".join(VARIANTS), help="danh sách biến thể, phân tách bằng dấu phẩy")
+    parser.add_argument("--posts", type=int, default=300, help="số bài trong feed và số bài cần lấy")
+    parser.add_argument("--latency", type=int, default=300, help="độ trễ tải mỗi lô bài (ms)")
+    parser.add_argument("--batch", type=int, default=5, help="số bài mỗi lần feed tải thêm")
+    parser.add_argument("--no-images", action="store_true", help="feed không có ảnh")
+    parser.add_argument("--submit-mode", choices=["bulk", "single"], default="bulk")
+    parser.add_argument("--submit-batch", type=int, default=20)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    # Log từng link của crawler làm nhiễu kết quả đo
+    logging.getLogger().setLevel(logging.WARNING)
+
+    results = []
+    with FixtureServer() as fixture:
+        for name in args.variants.split(","):
+            name = name.strip()
+            if name not in VARIANTS:
+                parser.error(f"biến thể không hợp lệ: {name}")
+            with ApiStubServer(bulk=args.submit_mode == "bulk") as api:
+                if VARIANTS[name] is None:
+                    results.append(run_http(name, args, fixture, api))
+                else:
+                    try:
+                        results.append(run_browser(name, VARIANTS[name], args, fixture, api))
+                    except WebDriverException as e:
+                        logging.error(f"Bỏ qua biến thể {name}: không mở được Chrome ({e.msg})")
+                        results.append({"variant": name, "error": e.msg})
+    emit(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
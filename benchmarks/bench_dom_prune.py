@@ -0,0 +1,59 @@
+"""Đo bộ nhớ renderer khi cuộn feed dài, có và không làm rỗng bài viết đã xử lý.
+
+    python -m benchmarks.bench_dom_prune --posts 600 --output prune.json
+
+Với mỗi chế độ, mở fixture group feed, cuộn bằng AdaptiveScroller và lấy link
+qua MutationObserver cho tới khi đủ số bài; ghi JSHeapUsedSize và số node DOM
+ngay sau khi tải trang và sau khi cuộn xong. Cần Chrome và chromedriver; nếu
+không mở được Chrome headless, benchmark dừng với mã lỗi 1 và không ghi kết quả.
+"""
+
+import time
+import argparse
+
+from selenium.common.exceptions import WebDriverException
+
+from benchmarks.common import FixtureServer, emit, harvest_links, make_driver, renderer_metrics
+from rpa_dom import install_link_observer
+
+
+def run(base_url, posts, prune):
+    driver = make_driver()
+    try:
+        driver.get(f"{base_url}/group_feed.html?total={posts}&latency=100&batch=10")
+        install_link_observer(driver)
+        before = renderer_metrics(driver)
+
+        started = time.monotonic()
+        collected = harvest_links(driver, posts, prune=prune)
+        elapsed = time.monotonic() - started
+
+        driver.execute_cdp_cmd("HeapProfiler.collectGarbage", {})
+        after = renderer_metrics(driver)
+        return {
+            "prune": prune,
+            "posts": len(collected),
+            "seconds": round(elapsed, 2),
+            "before": before,
+            "after": after,
+        }
+    finally:
+        driver.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--posts", type=int, default=600)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    with FixtureServer() as server:
+        try:
+            results = [run(server.base_url, args.posts, prune) for prune in (False, True)]
+        except WebDriverException as e:
+            parser.exit(1, f"Không mở được Chrome headless, không đo được bộ nhớ renderer: {e.msg}\n")
+    emit(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""So sánh băng thông và thời gian lấy đủ N bài viết khi bật / tắt chế độ duyệt nhẹ.
+
+    python -m benchmarks.bench_lean --posts 200 --output lean.json
+
+Fixture feed có ảnh ở mọi bài, video ở mỗi bài thứ 5 và một web font. Số byte
+là tổng ảnh/video/font server fixture đã gửi (HTML/JS giống nhau ở hai chế độ).
+Cần Chrome và chromedriver; chế độ nào không mở được Chrome headless được ghi
+kèm ``error`` thay cho số đo.
+"""
+
+import time
+import argparse
+
+from selenium.common.exceptions import WebDriverException
+
+from benchmarks.common import FixtureServer, emit, harvest_links, make_driver
+from rpa_browser import LeanProfile
+from rpa_dom import install_link_observer
+
+
+def run(posts, lean):
+    with FixtureServer() as server:
+        try:
+            driver = make_driver(lean=LeanProfile() if lean else None)
+        except WebDriverException as e:
+            return {"lean": lean, "error": f"Không mở được Chrome headless: {e.msg}"}
+        try:
+            started = time.monotonic()
+            driver.get(f"{server.base_url}/group_feed.html?total={posts}&latency=100&batch=10&video=5")
+            install_link_observer(driver)
+            collected = harvest_links(driver, posts)
+            elapsed = time.monotonic() - started
+            return {
+                "lean": lean,
+                "posts": len(collected),
+                "seconds_to_posts": round(elapsed, 2),
+                "resource_mb": round(server.bytes_sent / 1024 / 1024, 2),
+            }
+        except WebDriverException as e:
+            return {"lean": lean, "error": e.msg}
+        finally:
+            driver.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--posts", type=int, default=200)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    emit([run(args.posts, lean) for lean in (False, True)], args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Đo thời gian và bộ nhớ đỉnh khi xử lý file crawled lớn: cả file so với theo chunk.
+
+    python -m benchmarks.bench_process_stream --rows 1000000 --output process.json
+
+Sinh một file CSV giả lập có cùng bố cục cột với crawled.xlsx, rồi chạy mỗi
+chế độ trong một tiến trình con riêng (để đo RSS đỉnh độc lập, chỉ chạy trên
+Linux/macOS). ``--upload`` gửi thêm kết quả lên API giả lập cục bộ theo lô.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import tempfile
+import subprocess
+
+import numpy as np
+import pandas as pd
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COLUMNS = [
+    "ID", "NỘI DUNG", "TÁC GIẢ", "LIKE", "SHARE", "COMMENT", "Tổng tương tác", "DATE",
+    "TGIAN CHUẨN", "DATE CONVERTED", "ĐÃ XÓA", "ĐÃ THU THẬP ĐƯỢC", "TYPE",
+]
+DATES = ["5 giờ", "Hôm qua lúc 10:05", "3 ngày", "18 tháng 4 lúc 09:24", "19 tháng 11, 2024", "5 tháng 1"]
+
+
+def make_input(path, rows, chunk=100000):
+    """Ghi file CSV giả lập theo từng khối để tiến trình cha không tốn bộ nhớ."""
+    rng = np.random.default_rng(0)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        for start in range(0, rows, chunk):
+            n = min(chunk, rows - start)
+            likes, comments, shares = rng.integers(0, 500, n), rng.integers(0, 50, n), rng.integers(0, 20, n)
+            df = pd.DataFrame({
+                "ID": np.arange(start, start + n) + 1,
+                "NỘI DUNG": "Tân sinh viên cho mình hỏi lịch học với ạ",
+                "TÁC GIẢ": "Người tham gia ẩn danh",
+                "LIKE": np.nan,
+                "SHARE": np.nan,
+                "COMMENT": np.nan,
+                "Tổng tương tác": [
+                    f"Tất cả cảm xúc: {l} {c} bình luận {s} lượt chia sẻ"
+                    for l, c, s in zip(likes, comments, shares)
+                ],
+                "DATE": rng.choice(DATES, n),
+                "TGIAN CHUẨN": "2025-04-20 02:24:47",
+                "DATE CONVERTED": np.nan,
+                "ĐÃ XÓA": 0,
+                "ĐÃ THU THẬP ĐƯỢC": 1,
+                "TYPE": 1.0,
+            }, columns=COLUMNS)
+            df.to_csv(f, header=start == 0, index=False)
+
+
+def child(mode, input_path, chunk_size, upload):
+    """Chạy một chế độ trong tiến trình hiện tại, in JSON kết quả ra stdout."""
+    import contextlib
+
+    import rpa_process_data as p
+    from rpa_upload import RowUploader
+    from benchmarks.common import ApiStubServer
+
+    server = ApiStubServer() if upload else contextlib.nullcontext()
+    started = time.monotonic()
+    with server:
+        uploader = RowUploader(server.api_url, batch_size=500) if upload else None
+        if mode == "stream":
+            stats = p.process_stream(input_path, "out.csv", chunk_size, uploader)
+            rows = stats["rows"]
+        else:
+            df = p.process_file(input_path, "out.csv")
+            rows = len(df)
+            if uploader is not None:
+                uploader.upload(p.build_payloads(df))
+        if uploader is not None:
+            uploader.close()
+
+    print(json.dumps({
+        "mode": mode,
+        "rows": rows,
+        "chunk_size": chunk_size if mode == "stream" else None,
+        "upload": upload,
+        "seconds": round(time.monotonic() - started, 2),
+        # ru_maxrss tính bằng KB trên Linux, byte trên macOS
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--chunk-size", type=int, default=50000)
+    parser.add_argument("--upload", action="store_true", help="gửi kết quả lên API giả lập")
+    parser.add_argument("--output")
+    parser.add_argument("--child", choices=["full", "stream"], help=argparse.SUPPRESS)
+    parser.add_argument("--input", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.input, args.chunk_size, args.upload)
+        return
+
+    from benchmarks.common import emit
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = os.path.join(tmp, "crawled.csv")
+        make_input(input_path, args.rows)
+        env = dict(os.environ, PYTHONPATH=REPO_DIR)
+        for mode in ("full", "stream"):
+            cmd = [sys.executable, "-m", "benchmarks.bench_process_stream", "--child", mode,
+                   "--input", input_path, "--chunk-size", str(args.chunk_size)]
+            if args.upload:
+                cmd.append("--upload")
+            # Chạy trong thư mục tạm để file kết quả không rơi vào repo
+            out = subprocess.run(cmd, cwd=tmp, env=env, capture_output=True, text=True, check=True).stdout
+            results.append(json.loads(out.strip().splitlines()[-1]))
+    emit(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
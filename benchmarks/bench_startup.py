@@ -0,0 +1,118 @@
+"""Đo thời gian khởi động các lệnh của ``python -m rpacrawl`` bằng ``python -X importtime``.
+
+    python -m benchmarks.bench_startup --repeat 5 --output startup.json
+
+Mỗi lệnh chạy trong một tiến trình con riêng. Kết quả cho mỗi lệnh: thời gian
+chạy (trung vị, giây), tổng thời gian import theo ``-X importtime`` (ms) và các
+thư viện nặng (selenium, pandas, numpy, requests) đã bị import.
+
+Các mục ``eager_*`` import trực tiếp module cũ, tương đương cái giá mà mọi lệnh
+phải trả khi selenium/pandas còn được import ngay từ đầu script, để so sánh với
+``cookies`` (kiểm tra cookie) và ``upload`` (chỉ cập nhật API từ file CSV).
+"""
+
+import os
+import re
+import sys
+import csv
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+from benchmarks.common import ApiStubServer, emit
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ("selenium", "pandas", "numpy", "requests")
+
+_IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def make_cookie_file(path):
+    expiry = int(time.time()) + 30 * 86400
+    with open(path, "w", encoding="utf-8") as f:
+        for name in ("c_user", "xs", "datr", "fr", "sb"):
+            f.write(f".facebook.com\tTRUE\t/\tTRUE\t{expiry}\t{name}\tvalue\n")
+
+
+def make_processed_csv(path, rows):
+    """File CSV cùng bố cục với kết quả của lệnh process."""
+    header = [
+        "ID", "NỘI DUNG", "TÁC GIẢ", "LIKE", "SHARE", "COMMENT", "Tổng tương tác", "DATE",
+        "TGIAN CHUẨN", "DATE CONVERTED", "ĐÃ XÓA", "ĐÃ THU THẬP ĐƯỢC", "TYPE",
+    ]
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for i in range(rows):
+            writer.writerow([
+                i + 1, "Tân sinh viên cho mình hỏi lịch học với ạ", "Người tham gia ẩn danh",
+                float(i % 50), float(i % 7), float(i % 11), f"Tất cả cảm xúc: {i % 50}", "5 giờ",
+                "2025-04-20 02:24:47", "2025-04-20 00:00:00", 0, 1, 1.0,
+            ])
+
+
+def parse_importtime(stderr):
+    """Tổng thời gian import (µs, cộng cột self) và tập tên module gốc đã được import."""
+    total = 0
+    roots = set()
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if match:
+            total += int(match.group(1))
+            roots.add(match.group(4).split(".")[0])
+    return total, roots
+
+
+def measure(name, argv, repeat):
+    walls, imports = [], []
+    roots = set()
+    for _ in range(repeat):
+        started = time.monotonic()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", *argv],
+            cwd=REPO_DIR,
+            capture_output=True,
+            text=True,
+        )
+        walls.append(time.monotonic() - started)
+        total, roots = parse_importtime(proc.stderr)
+        imports.append(total)
+    return {
+        "command": name,
+        "exit_code": proc.returncode,
+        "wall_seconds": round(statistics.median(walls), 3),
+        "import_ms": round(statistics.median(imports) / 1000, 1),
+        "heavy_modules": [module for module in HEAVY_MODULES if module in roots],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="số lần chạy mỗi lệnh (lấy trung vị)")
+    parser.add_argument("--rows", type=int, default=200, help="số dòng trong file CSV của lệnh upload")
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp, ApiStubServer() as api:
+        cookie_path = os.path.join(tmp, "cookies.txt")
+        csv_path = os.path.join(tmp, "processed.csv")
+        make_cookie_file(cookie_path)
+        make_processed_csv(csv_path, args.rows)
+
+        commands = [
+            ("help", ["-m", "rpacrawl", "--help"]),
+            ("cookies", ["-m", "rpacrawl", "cookies", "--cookies", cookie_path]),
+            ("upload", ["-m", "rpacrawl", "upload", "--input", csv_path, "--no-delta", "--api-url", api.api_url]),
+            ("crawl_help", ["-m", "rpacrawl", "crawl", "--help"]),
+            ("eager_session", ["-c", "import rpacrawl.session"]),
+            ("eager_process_data", ["-c", "import rpa_process_data"]),
+        ]
+        results = [measure(name, argv, args.repeat) for name, argv in commands]
+    emit(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
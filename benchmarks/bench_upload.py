@@ -0,0 +1,81 @@
+"""Đo tốc độ cập nhật dữ liệu bài viết (dòng/s) lên API giả lập cục bộ.
+
+    python -m benchmarks.bench_upload --rows 5000 --latency 0.02 --output upload.json
+
+So sánh cách cũ (từng dòng, tuần tự), từng dòng song song, và gửi theo lô
+song song; server giả có độ trễ cố định mỗi request để mô phỏng mạng.
+"""
+
+import argparse
+import logging
+
+from benchmarks.common import ApiStubServer, emit
+from rpa_api_client import ApiClient
+from rpa_upload import RowUploader
+
+VARIANTS = [
+    ("single_serial", {"bulk": False, "workers": 1}),
+    ("single_parallel", {"bulk": False, "workers": 8}),
+    ("bulk_parallel", {"bulk": True, "workers": 4}),
+]
+
+
+def make_rows(n):
+    return [
+        {
+            "id_bai_viet": 100000 + i,
+            "id_nguoi_dung": f"Sinh viên {i}",
+            "noi_dung_bai_viet": "Tân sinh viên cho mình hỏi lịch học với ạ " * 5,
+            "like": i % 50,
+            "share": i % 3,
+            "comment": i % 7,
+            "content": f"Tất cả cảm xúc: {i % 50} {i % 7} bình luận {i % 3} lượt chia sẻ",
+            "created": "5 tháng 6 lúc 15:37",
+            "created_time": "2025-06-05 15:37:00",
+            "inserted_time": "2025-06-06 08:00:00",
+            "modified_time": "2025-06-06 09:00:00",
+            "is_deleted": 0,
+        }
+        for i in range(n)
+    ]
+
+
+def run(name, options, rows, batch_size, latency):
+    with ApiStubServer(bulk=options["bulk"], latency=latency) as server:
+        uploader = RowUploader(
+            server.api_url,
+            batch_size=batch_size,
+            workers=options["workers"],
+            bulk=options["bulk"],
+            client=ApiClient(pool_size=options["workers"]),
+        )
+        try:
+            report = uploader.upload(rows)
+        finally:
+            uploader.close()
+        return {
+            "variant": name,
+            "rows": report["rows"],
+            "updated": report["updated"],
+            "seconds": report["seconds"],
+            "rows_per_sec": report["rows_per_sec"],
+            "api_calls": server.api_calls,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.02, help="độ trễ mỗi request (giây)")
+    parser.add_argument("--output")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    rows = make_rows(args.rows)
+    results = [run(name, options, rows, args.batch_size, args.latency) for name, options in VARIANTS]
+    emit(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
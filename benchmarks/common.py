@@ -0,0 +1,348 @@
+"""Tiện ích dùng chung cho các benchmark: server fixture cục bộ và Chrome headless.
+
+Chạy từ thư mục gốc của repo, ví dụ::
+
+    python -m benchmarks.bench_dom_prune
+"""
+
+import os
+import json
+import time
+import threading
+from urllib.parse import parse_qs, urlparse
+from http.server import BaseHTTPRequestHandler, SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Ảnh giả ~30KB cho mỗi bài viết để feed có tải trọng giống thật
+_IMAGE_BYTES = (
+    '<svg xmlns="http://www.w3.org/2000/svg" width="680" height="320">'
+    '<rect width="100%" height="100%" fill="#ccc"/><!--' + "x" * 30000 + "--></svg>"
+).encode()
+
+# Video (~200KB) và web font (~50KB) giả: trình duyệt không giải mã được nhưng
+# vẫn tải về, đủ để đo băng thông
+_MEDIA_BYTES = b"\x00" * 200000
+_FONT_BYTES = b"\x00" * 50000
+
+
+def mbasic_page(group, page, total, page_size):
+    """HTML một trang group kiểu mbasic: page_size bài viết và link "Xem thêm bài viết"."""
+    start = page * page_size
+    posts = "".join(
+        f'<article><a href="/groups/{group}/posts/{1000000 + i}/?refid=18">{i % 23 + 1} giờ</a>'
+        f"<p>Tân sinh viên cho mình hỏi lịch học với ạ</p></article>"
+        for i in range(start, min(total, start + page_size))
+    )
+    more = ""
+    if start + page_size < total:
+        more = f'<a href="/mbasic/groups/{group}?bacr={page + 1}">Xem thêm bài viết</a>'
+    return f"<html><body><div id=\"m_group_stories_container\">{posts}</div>{more}</body></html>".encode()
+
+
+class FixtureHandler(SimpleHTTPRequestHandler):
+    """Phục vụ thư mục fixtures, ảnh/video/font giả và ghi lại số byte tài nguyên đã gửi.
+
+    ``/mbasic/groups/<group>?bacr=<trang>`` là bản giả của giao diện mbasic cho
+    backend HTTP, số bài và độ trễ theo ``mbasic_total`` / ``mbasic_latency`` của server.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, directory=FIXTURES_DIR, **kwargs)
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.startswith("/img/"):
+            self._send(200, "image/svg+xml", _IMAGE_BYTES)
+            return
+        if self.path.startswith("/media/"):
+            self._send(200, "video/mp4", _MEDIA_BYTES)
+            return
+        if self.path.startswith("/fonts/"):
+            self._send(200, "font/woff2", _FONT_BYTES)
+            return
+        if self.path.startswith("/mbasic/groups/"):
+            url = urlparse(self.path)
+            page = int(parse_qs(url.query).get("bacr", ["0"])[0])
+            if self.server.mbasic_latency:
+                time.sleep(self.server.mbasic_latency)
+            body = mbasic_page(url.path.rsplit("/", 1)[-1], page, self.server.mbasic_total, 10)
+            self._send(200, "text/html; charset=utf-8", body)
+            return
+        super().do_GET()
+
+    def _send(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.bytes_sent += len(body)
+
+
+class FixtureServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, handler=FixtureHandler):
+        super().__init__(("127.0.0.1", 0), handler)
+        self.bytes_sent = 0
+        self.mbasic_total = 300
+        self.mbasic_latency = 0.0
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+
+def _item_key(item):
+    # Link (gửi link) hoặc id_bai_viet (cập nhật bài viết) của một bản ghi
+    return item.get("url", item.get("id_bai_viet")) if isinstance(item, dict) else item
+
+
+class ApiStubHandler(BaseHTTPRequestHandler):
+    """Giả lập api_bai_viet.php: nhận POST/PUT từng bản ghi hoặc theo lô ("urls"/"rows")."""
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        self._handle()
+
+    do_PUT = do_POST
+
+    def _handle(self):
+        server = self.server
+        if server.latency:
+            time.sleep(server.latency)
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        except ValueError:
+            body = None
+
+        with server.lock:
+            server.bodies.append(body)
+
+        items = None
+        if isinstance(body, dict) and server.bulk:
+            items = body.get("urls", body.get("rows"))
+        if isinstance(items, list):
+            if server.bulk_status is not None:
+                self._reply(server.bulk_status, {"message": f"HTTP {server.bulk_status}"})
+                return
+            results = [
+                {"ok": False, "error": "Bị từ chối"} if _item_key(item) in server.reject else {"ok": True}
+                for item in items
+            ]
+            if server.max_results is not None:
+                results = results[:server.max_results]
+            out = {"message": "Cập nhật theo lô thành công", "results": results}
+        elif isinstance(body, dict) and ("url" in body or "id_bai_viet" in body):
+            if _item_key(body) in server.reject:
+                self._reply(422, {"message": "Bị từ chối"})
+                return
+            items = [body]
+            out = {"message": "Thêm bài viết thành công"}
+        else:
+            self._reply(400, {"message": "Thiếu dữ liệu"})
+            return
+
+        with server.lock:
+            server.api_calls += 1
+            server.records += len(items)
+        self._reply(200, out)
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class ApiStubServer(FixtureServer):
+    """Server API giả, đếm số request và số bản ghi nhận được.
+
+    bulk=False mô phỏng server cũ chỉ nhận từng bản ghi; latency (giây) là độ
+    trễ thêm vào mỗi request để gần với mạng thật. Dùng cho test:
+
+    - reject: tập link / id_bai_viet bị từ chối (``"ok": false`` trong lô, HTTP 422 khi gửi lẻ);
+    - max_results: chỉ trả về chừng này phần tử ``results`` cho mỗi lô;
+    - bulk_status: mã HTTP trả về cho mọi request theo lô (ví dụ 429);
+    - bodies: body JSON của mọi request đã nhận, theo thứ tự.
+    """
+
+    def __init__(self, bulk=True, latency=0.0, reject=(), max_results=None, bulk_status=None):
+        super().__init__(ApiStubHandler)
+        self.bulk = bulk
+        self.latency = latency
+        self.reject = set(reject)
+        self.max_results = max_results
+        self.bulk_status = bulk_status
+        self.api_calls = 0
+        self.records = 0
+        self.bodies = []
+        self.lock = threading.Lock()
+
+    @property
+    def api_url(self):
+        return f"{self.base_url}/api_bai_viet.php"
+
+
+def make_driver(extra_args=(), lean=None):
+    """Chrome headless cho benchmark, không cần profile hay cookie Facebook.
+
+    lean là một rpa_browser.LeanProfile để áp dụng chế độ duyệt nhẹ (hoặc None).
+    """
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
+    options = Options()
+    for arg in ("--headless=new", "--disable-gpu", "--no-sandbox", "--disable-dev-shm-usage",
+                "--window-size=1280,900", *extra_args):
+        options.add_argument(arg)
+    if lean:
+        lean.apply_options(options)
+    driver = webdriver.Chrome(options=options)
+    if lean:
+        lean.apply_driver(driver)
+    return driver
+
+
+def harvest_links(driver, posts, prune=False, max_idle=3):
+    """Cuộn feed bằng AdaptiveScroller và lấy link qua MutationObserver tới khi đủ posts bài.
+
+    Dừng sớm sau max_idle lần cuộn liên tiếp không ra link mới (hết feed hoặc
+    trang đứng yên); prune=True làm rỗng bài viết đã lấy link sau mỗi lần cuộn.
+    Cần gọi ``install_link_observer`` trước. Trả về tập link đã lấy.
+    """
+    from rpa_dom import drain_post_links, prune_harvested_posts
+    from rpa_scroll import AdaptiveScroller
+
+    scroller = AdaptiveScroller(min_delay=0, max_wait=2)
+    collected = set()
+    idle = 0
+    while len(collected) < posts and idle < max_idle:
+        result = scroller.scroll(driver)
+        links = drain_post_links(driver)
+        collected.update(links)
+        if prune:
+            prune_harvested_posts(driver, links)
+        idle = idle + 1 if result["reason"] in ("timeout", "stuck") and not links else 0
+    return collected
+
+
+def _process_tree(root_pid):
+    """PID của root_pid và mọi tiến trình con cháu (đọc /proc, chỉ chạy trên Linux)."""
+    children = {}
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat", "r") as f:
+                # Trường thứ 4 là PPID; tên tiến trình (trong ngoặc) có thể chứa dấu cách
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(name))
+
+    pids, stack = [], [root_pid]
+    while stack:
+        pid = stack.pop()
+        pids.append(pid)
+        stack.extend(children.get(pid, ()))
+    return pids
+
+
+def _rss_kb(pid):
+    try:
+        with open(f"/proc/{pid}/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+class MemorySampler:
+    """Lấy mẫu tổng RSS của cây tiến trình chromedriver/Chrome trong nền, giữ giá trị đỉnh.
+
+    Dùng làm context manager quanh đoạn cần đo; ``peak_mb`` là None nếu không
+    đọc được /proc (không phải Linux).
+    """
+
+    def __init__(self, driver, interval=0.5):
+        self.root_pid = driver.service.process.pid
+        self.interval = interval
+        self.peak_kb = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @property
+    def peak_mb(self):
+        return round(self.peak_kb / 1024, 1) if self.peak_kb else None
+
+    def sample(self):
+        if not os.path.isdir("/proc"):
+            return
+        total = sum(_rss_kb(pid) for pid in _process_tree(self.root_pid))
+        self.peak_kb = max(self.peak_kb, total)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def __enter__(self):
+        self.sample()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.sample()
+
+
+def count_webdriver_calls(driver):
+    """Đếm mọi lệnh WebDriver gửi qua driver (kể cả từ WebElement); trả về list 1 phần tử [số lệnh]."""
+    counter = [0]
+    execute = driver.execute
+
+    def counting_execute(driver_command, params=None):
+        counter[0] += 1
+        return execute(driver_command, params)
+
+    driver.execute = counting_execute
+    return counter
+
+
+def renderer_metrics(driver):
+    """Đọc JSHeapUsedSize / Nodes của trang qua CDP Performance.getMetrics."""
+    driver.execute_cdp_cmd("Performance.enable", {})
+    metrics = driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+    values = {m["name"]: m["value"] for m in metrics}
+    return {
+        "js_heap_used_mb": round(values.get("JSHeapUsedSize", 0) / 1024 / 1024, 2),
+        "dom_nodes": int(values.get("Nodes", 0)),
+    }
+
+
+def emit(results, path=None):
+    """In kết quả dạng JSON, ghi thêm ra file nếu có path."""
+    text = json.dumps(results, ensure_ascii=False, indent=2)
+    print(text)
+    if path:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
@@ -0,0 +1,139 @@
+"""HTTP client dùng chung cho các lời gọi tới api.rpa4edu.shop.
+
+``ApiClient`` bọc một ``requests.Session`` để tái sử dụng kết nối (keep-alive,
+connection pool), luôn đặt timeout cho mỗi request, tự thử lại với backoff lũy
+thừa có jitter khi gặp lỗi kết nối hoặc HTTP 5xx, và ngắt mạch (circuit breaker)
+khi endpoint lỗi liên tục để không treo cả tiến trình chờ một server đã chết.
+"""
+
+import time
+import random
+import logging
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from rpa_env import env_float, env_int
+from rpa_metrics import metrics
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Endpoint đang bị ngắt mạch do lỗi liên tục, request không được gửi đi."""
+
+
+class CircuitBreaker:
+    """Ngắt mạch sau ``threshold`` lần lỗi liên tiếp, mở lại thử sau ``cooldown`` giây."""
+
+    def __init__(self, threshold=5, cooldown=30.0):
+        self.threshold = max(1, threshold)
+        self.cooldown = cooldown
+        self._failures = 0
+        self._opened_at = None
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """True nếu được phép gửi request (mạch đóng, hoặc đã hết thời gian chờ)."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at >= self.cooldown:
+                # Half-open: cho một request thử, lỗi tiếp thì mở lại ngay
+                self._opened_at = None
+                self._failures = self.threshold - 1
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.threshold and self._opened_at is None:
+                self._opened_at = time.monotonic()
+                logging.error(
+                    f"API lỗi {self._failures} lần liên tiếp, tạm ngắt kết nối trong {self.cooldown:.0f}s."
+                )
+
+
+class ApiClient:
+    """Session HTTP có connection pool, timeout, thử lại với backoff và ngắt mạch."""
+
+    def __init__(
+        self,
+        timeout=(5, 15),
+        max_attempts=3,
+        backoff=1.0,
+        pool_size=10,
+        breaker_threshold=5,
+        breaker_cooldown=30.0,
+    ):
+        self.timeout = timeout
+        self.max_attempts = max(1, max_attempts)
+        self.backoff = backoff
+        self.breaker = CircuitBreaker(breaker_threshold, breaker_cooldown)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    @classmethod
+    def from_env(cls, pool_size=10):
+        """Tạo client từ các biến môi trường API_*."""
+        return cls(
+            timeout=(env_float("API_CONNECT_TIMEOUT", 5), env_float("API_READ_TIMEOUT", 15)),
+            max_attempts=env_int("API_MAX_ATTEMPTS", 3),
+            backoff=env_float("API_BACKOFF", 1.0),
+            pool_size=pool_size,
+            breaker_threshold=env_int("API_BREAKER_THRESHOLD", 5),
+            breaker_cooldown=env_float("API_BREAKER_COOLDOWN", 30),
+        )
+
+    def request(self, method, url, **kwargs):
+        """Gửi request, thử lại khi lỗi kết nối hoặc HTTP 5xx.
+
+        Trả về response cuối cùng (kể cả 5xx nếu đã hết số lần thử); ném lại
+        lỗi kết nối cuối cùng, hoặc ``CircuitOpenError`` nếu mạch đang ngắt.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        for attempt in range(1, self.max_attempts + 1):
+            if not self.breaker.allow():
+                metrics.inc("api_circuit_open", method=method)
+                raise CircuitOpenError(f"API {url} đang bị ngắt mạch do lỗi liên tục")
+
+            started = time.monotonic()
+            try:
+                resp = self.session.request(method, url, **kwargs)
+            except requests.exceptions.RequestException as e:
+                metrics.observe("api_request", time.monotonic() - started, method=method, status="error")
+                self.breaker.record_failure()
+                if attempt == self.max_attempts:
+                    raise
+                reason = f"lỗi kết nối: {e}"
+            else:
+                metrics.observe("api_request", time.monotonic() - started, method=method, status=resp.status_code)
+                if resp.status_code < 500:
+                    self.breaker.record_success()
+                    return resp
+                self.breaker.record_failure()
+                if attempt == self.max_attempts:
+                    return resp
+                reason = f"HTTP {resp.status_code}"
+
+            delay = self.backoff * 2 ** (attempt - 1) * random.uniform(0.5, 1.5)
+            metrics.inc("api_retries", method=method)
+            logging.warning(f"{method} {url} lỗi lần {attempt} ({reason}). Đợi {delay:.1f}s rồi thử lại...")
+            time.sleep(delay)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,84 @@
+"""Chế độ duyệt "nhẹ" cho Chrome: không tải ảnh, video, font và script quảng cáo.
+
+Crawler chỉ cần link và chữ trong bài viết, nhưng feed Facebook kéo theo rất
+nhiều ảnh, thumbnail video và font; trên runner CI chúng chiếm phần lớn băng
+thông và làm chậm mỗi lần tải thêm bài. ``LeanProfile``:
+
+- chặn ảnh bằng content setting của Chrome (``apply_options``, trước khi mở trình duyệt);
+- chặn các URL nặng theo mẫu (video, font, quảng cáo/analytics) bằng CDP
+  ``Network.setBlockedURLs`` (``apply_driver``, sau khi mở trình duyệt);
+- ``allow_hosts`` là danh sách host vẫn được tải ảnh và, nếu Chrome hỗ trợ
+  dạng ``urlPatterns`` của lệnh trên, không bị chặn theo mẫu.
+
+Bật bằng ``LEAN_BROWSING=true``; ``LEAN_BLOCK_PATTERNS`` thay danh sách mẫu
+mặc định, ``LEAN_ALLOW_HOSTS`` đặt danh sách host được phép (phân tách bằng dấu phẩy).
+"""
+
+import os
+import logging
+
+DEFAULT_BLOCKED_PATTERNS = [
+    # Video và luồng video
+    "*.mp4*", "*.webm*", "*.m3u8*", "*.mpd*", "*video*.fbcdn.net/*",
+    # Font
+    "*.woff*", "*.ttf*", "*.otf*",
+    # Quảng cáo / analytics bên thứ ba
+    "*doubleclick.net/*", "*google-analytics.com/*", "*googletagmanager.com/*",
+]
+
+
+def _split_env(name):
+    return [item.strip() for item in os.getenv(name, "").split(",") if item.strip()]
+
+
+class LeanProfile:
+    """Cấu hình chặn tài nguyên nặng cho một trình duyệt Chrome."""
+
+    def __init__(self, block_images=True, blocked_patterns=None, allow_hosts=()):
+        self.block_images = block_images
+        self.blocked_patterns = list(DEFAULT_BLOCKED_PATTERNS if blocked_patterns is None else blocked_patterns)
+        self.allow_hosts = list(allow_hosts)
+
+    @classmethod
+    def from_env(cls, enabled=None):
+        """LeanProfile theo LEAN_*, hoặc None nếu không bật (enabled=None: theo LEAN_BROWSING)."""
+        if enabled is None:
+            enabled = os.getenv("LEAN_BROWSING", "false").lower() == "true"
+        if not enabled:
+            return None
+        return cls(
+            blocked_patterns=_split_env("LEAN_BLOCK_PATTERNS") or None,
+            allow_hosts=_split_env("LEAN_ALLOW_HOSTS"),
+        )
+
+    def apply_options(self, options):
+        """Thêm prefs/argument chặn tài nguyên vào ChromeOptions."""
+        prefs = {}
+        if self.block_images:
+            # Giá trị mặc định (không phải "managed") để ngoại lệ theo host còn hiệu lực
+            prefs["profile.default_content_setting_values.images"] = 2
+            if self.allow_hosts:
+                prefs["profile.content_settings.exceptions.images"] = {
+                    f"[*.]{host},*": {"setting": 1} for host in self.allow_hosts
+                }
+        if prefs:
+            options.add_experimental_option("prefs", prefs)
+        # Video không tự phát nên không tải trước các đoạn video
+        options.add_argument("--autoplay-policy=user-gesture-required")
+        return options
+
+    def apply_driver(self, driver):
+        """Chặn các URL khớp blocked_patterns qua CDP trên trình duyệt đã mở."""
+        if not self.blocked_patterns:
+            return
+        driver.execute_cdp_cmd("Network.enable", {})
+        if self.allow_hosts:
+            # Dạng mới (Chrome gần đây): mẫu đầu tiên khớp quyết định chặn hay cho qua
+            patterns = [{"urlPattern": f"*://{host}/*", "block": False} for host in self.allow_hosts]
+            patterns += [{"urlPattern": p, "block": True} for p in self.blocked_patterns]
+            try:
+                driver.execute_cdp_cmd("Network.setBlockedURLs", {"urlPatterns": patterns})
+                return
+            except Exception as e:
+                logging.warning(f"Chrome không hỗ trợ allowlist cho Network.setBlockedURLs, chỉ áp dụng cho ảnh: {e}")
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.blocked_patterns})
@@ -0,0 +1,140 @@
+"""Lưu tiến độ crawl từng group ra file để tiếp tục khi bị ngắt giữa chừng.
+
+Mỗi group có một mục trong file JSON::
+
+    {"groups": {"https://www.facebook.com/groups/...": {
+        "collected": ["https://www.facebook.com/groups/.../posts/1/", ...],
+        "pending": [...],           # link đã thu thập nhưng API chưa xác nhận
+        "scroll_y": 18400,          # vị trí cuộn gần nhất (backend Selenium)
+        "cursor": "https://mbasic...",  # trang kế tiếp (backend HTTP)
+        "updated_at": "2025-06-05 15:37:00"}}}
+
+File được ghi định kỳ (tối đa một lần mỗi ``interval`` giây, ghi ra file tạm
+rồi đổi tên nên không bị hỏng khi tiến trình bị kill) và mục của group bị
+xóa khi group đó crawl xong. Lần chạy sau (hoặc lần thử lại của
+``retry_on_failure``) khôi phục các link đã thu thập, gửi lại những link
+chưa được API xác nhận và cuộn nhanh tới gần vị trí cũ. Mục cũ hơn
+``max_age`` giây bị bỏ qua vì feed đã thay đổi nhiều.
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from datetime import datetime
+
+from rpa_env import env_float
+
+DEFAULT_PATH = "crawl_checkpoint.json"
+
+_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class CrawlCheckpoint:
+    """Trạng thái crawl dở dang theo group, đồng bộ với một file JSON."""
+
+    def __init__(self, path=DEFAULT_PATH, interval=15.0, max_age=6 * 3600, resume=True):
+        self.path = path
+        self.interval = interval
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._groups = self._load() if resume else {}
+        self._dirty = False
+        self._last_save = 0.0
+
+    @classmethod
+    def from_env(cls):
+        """Tạo checkpoint từ CHECKPOINT_PATH, CHECKPOINT_INTERVAL, CHECKPOINT_MAX_AGE, RESUME."""
+        return cls(
+            os.getenv("CHECKPOINT_PATH", DEFAULT_PATH),
+            interval=env_float("CHECKPOINT_INTERVAL", 15),
+            max_age=env_float("CHECKPOINT_MAX_AGE", 6 * 3600),
+            resume=os.getenv("RESUME", "true").lower() == "true",
+        )
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                groups = json.load(f).get("groups", {})
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logging.warning(f"Không đọc được checkpoint {self.path}, bắt đầu lại từ đầu: {e}")
+            return {}
+
+        now = datetime.now()
+        fresh = {}
+        for group_url, state in groups.items():
+            try:
+                age = (now - datetime.strptime(state["updated_at"], _TIME_FORMAT)).total_seconds()
+            except (KeyError, ValueError):
+                continue
+            if age <= self.max_age:
+                fresh[group_url] = state
+        if fresh:
+            logging.info(f"Khôi phục checkpoint của {len(fresh)} group từ {self.path}")
+        return fresh
+
+    def get(self, group_url):
+        """Trạng thái đã lưu của group (dict), hoặc None nếu không có."""
+        with self._lock:
+            state = self._groups.get(group_url)
+            return dict(state) if state else None
+
+    def restore(self, group_url, submitter):
+        """Khôi phục tiến độ của group; trả về (tập link đã thu thập, trạng thái hoặc None).
+
+        Link đã thu thập nhưng chưa được API xác nhận (không có trong chỉ mục
+        link đã gửi) được đưa lại vào hàng đợi của submitter.
+        """
+        state = self.get(group_url)
+        if not state:
+            return set(), None
+        collected = set(state.get("collected", []))
+        requeued = sum(1 for url in collected if not submitter.already_sent(url) and submitter.add(url))
+        logging.info(
+            f"Tiếp tục group {group_url} từ checkpoint lúc {state.get('updated_at')}: "
+            f"{len(collected)} link đã thu thập, gửi lại {requeued} link chưa được xác nhận"
+        )
+        return collected, state
+
+    def update(self, group_url, collected, submitter, scroll_y=None, cursor=None):
+        """Ghi nhận tiến độ của group; ghi ra file nếu đã quá interval giây từ lần ghi trước."""
+        pending = sorted(url for url in collected if not submitter.already_sent(url))
+        with self._lock:
+            self._groups[group_url] = {
+                "collected": sorted(collected),
+                "pending": pending,
+                "scroll_y": scroll_y,
+                "cursor": cursor,
+                "updated_at": datetime.now().strftime(_TIME_FORMAT),
+            }
+            self._dirty = True
+            if time.monotonic() - self._last_save >= self.interval:
+                self._save_locked()
+
+    def mark_done(self, group_url):
+        """Group đã crawl xong: xóa mục của nó và ghi file ngay."""
+        with self._lock:
+            if self._groups.pop(group_url, None) is not None:
+                self._dirty = True
+                self._save_locked()
+
+    def flush(self):
+        """Ghi mọi thay đổi chưa lưu ra file."""
+        with self._lock:
+            if self._dirty:
+                self._save_locked()
+
+    def _save_locked(self):
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"groups": self._groups}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logging.error(f"Không ghi được checkpoint {self.path}: {e}")
+            return
+        self._dirty = False
+        self._last_save = time.monotonic()
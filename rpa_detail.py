@@ -0,0 +1,240 @@
+"""Lấy chi tiết bài viết từ các link đã gửi và đưa thẳng vào bước xử lý dữ liệu.
+
+Đọc link từ chỉ mục ``SeenIndex`` (mới nhất trước, tối đa ``DETAIL_LIMIT``)
+hoặc từ file ``DETAIL_URLS_FILE`` (mỗi dòng một link), mở từng bài viết bằng
+``DETAIL_CONCURRENCY`` trình duyệt song song (mượn từ ``DriverPool``), với
+tổng tốc độ tải trang giới hạn chung bởi ``RateLimiter``
+(``DETAIL_RATE_PER_MINUTE``). Mỗi bài viết chỉ cần một lần ``execute_script``
+để lấy tác giả, nội dung, dòng tương tác và thời gian đăng.
+
+Các bản ghi có cùng bố cục cột với ``crawled.xlsx`` (thêm cột URL) và đi qua
+đúng pipeline của ``rpa_process_data``: tính LIKE/SHARE/COMMENT, chuẩn hóa
+ngày rồi lưu ``DETAIL_OUTPUT`` (CSV, hoặc Parquet nếu có pyarrow).
+
+Cột ID là ID bài viết Facebook trong URL (``/posts/<id>/``, ``/permalink/<id>/``
+hoặc ``story_fbid=<id>``), giữ dạng chuỗi vì số 17 chữ số không biểu diễn đúng
+bằng float. ID này không phải ID dòng của API nên không được gửi làm
+``id_bai_viet``: khi upload, dòng được nhận diện bằng ``url`` (link đã gửi ở
+bước lấy link), ID Facebook đi kèm trong ``post_id``, và chỉ mục upload dùng
+bảng riêng theo url.
+
+Mặc định KHÔNG upload (``DETAIL_UPLOAD=false``): ``api_bai_viet.php`` hiện chỉ
+tìm dòng theo ``id_bai_viet`` và chưa hỗ trợ ``"key": "url"``, cũng chưa có
+cách tra ``id_bai_viet`` từ link. Nếu server trả về 200 mà bỏ qua khóa lạ, dòng
+bị coi là đã cập nhật và hash được ghi vào chỉ mục, nên sẽ không bao giờ được
+gửi lại kể cả khi API đã hỗ trợ url. Chỉ đặt ``DETAIL_UPLOAD=true`` khi API đã
+nhận diện dòng theo url.
+"""
+
+import os
+import re
+import queue
+import logging
+import threading
+from datetime import datetime
+
+import pandas as pd
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from rpa_env import env_float, env_int
+from rpacrawl.session import is_session_alive, open_session
+from rpa_dom import extract_post_detail
+from rpa_jobs import DriverPool, RateLimiter
+from rpa_logging import ProgressLog, setup_logging
+from rpa_metrics import metrics
+from rpa_process_data import VietnameseDateParser, build_payloads, require_parquet_support, save_table, transform
+from rpa_seen_index import SeenIndex
+from rpa_upload import API_URL, RowUploader
+from rpa_upload_index import UploadIndex
+
+# Cùng thứ tự cột với crawled.xlsx (rpa_process_data đọc theo vị trí), thêm URL ở cuối
+DETAIL_COLUMNS = [
+    "ID", "NỘI DUNG", "TÁC GIẢ", "LIKE", "SHARE", "COMMENT", "Tổng tương tác", "DATE",
+    "TGIAN CHUẨN", "DATE CONVERTED", "ĐÃ XÓA", "ĐÃ THU THẬP ĐƯỢC", "TYPE", "URL",
+]
+
+_POST_ID_RE = re.compile(r"(?:/posts/|/permalink/|story_fbid=)(\d+)")
+
+
+def post_id_from_url(url):
+    """ID bài viết trong URL (chuỗi chữ số), hoặc None."""
+    match = _POST_ID_RE.search(url)
+    return match.group(1) if match else None
+
+
+def load_detail_urls(seen_index, limit=None):
+    """Link cần lấy chi tiết: từ DETAIL_URLS_FILE nếu có, không thì từ chỉ mục link đã gửi."""
+    urls_file = os.getenv("DETAIL_URLS_FILE")
+    if not urls_file:
+        return seen_index.recent(limit)
+
+    urls = []
+    try:
+        with open(urls_file, "r", encoding="utf-8") as f:
+            for line in f:
+                url = line.strip()
+                if url and not url.startswith("#") and url not in urls:
+                    urls.append(url)
+    except OSError as e:
+        logging.error(f"Không đọc được file danh sách link {urls_file}: {e}")
+    return urls[:limit] if limit else urls
+
+
+def scrape_post(driver, url, wait_seconds=10):
+    """Mở một bài viết và trích xuất chi tiết; trả về dict theo DETAIL_COLUMNS hoặc None."""
+    post_id = post_id_from_url(url)
+    driver.get(url)
+    try:
+        WebDriverWait(driver, wait_seconds).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, '[role="article"]'))
+        )
+    except TimeoutException:
+        logging.warning(f"Không thấy nội dung bài viết (đã bị xóa hoặc không có quyền xem?): {url}")
+        return None
+
+    detail = extract_post_detail(driver, post_id)
+    if not detail:
+        return None
+    return {
+        "ID": post_id,
+        "NỘI DUNG": detail["text"],
+        "TÁC GIẢ": detail["author"],
+        "LIKE": None,
+        "SHARE": None,
+        "COMMENT": None,
+        "Tổng tương tác": detail["interactions"],
+        "DATE": detail["date"],
+        "TGIAN CHUẨN": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "DATE CONVERTED": None,
+        "ĐÃ XÓA": 0,
+        "ĐÃ THU THẬP ĐƯỢC": 1,
+        "TYPE": None,
+        "URL": url,
+    }
+
+
+def scrape_details(urls, pool, limiter, concurrency=1):
+    """Lấy chi tiết các bài viết bằng tối đa ``concurrency`` trình duyệt song song.
+
+    pool là một DriverPool; limiter (RateLimiter) giới hạn tổng số lượt tải
+    trang của mọi worker. Trình duyệt lỗi bị đóng và thay bằng trình duyệt mới.
+    Trả về danh sách bản ghi (dict theo DETAIL_COLUMNS) theo thứ tự hoàn thành.
+    """
+    jobs = queue.Queue()
+    for url in urls:
+        jobs.put(url)
+
+    records = []
+    lock = threading.Lock()
+    progress = ProgressLog("Chi tiết bài viết", total=len(urls), unit="bài")
+
+    def worker():
+        driver = None
+        try:
+            while True:
+                try:
+                    url = jobs.get_nowait()
+                except queue.Empty:
+                    return
+
+                if driver is None:
+                    driver = pool.acquire()
+                    if driver is None:
+                        jobs.put(url)
+                        logging.error("Không mở được phiên trình duyệt đã đăng nhập, worker dừng.")
+                        return
+
+                limiter.wait()
+                try:
+                    with metrics.timer("post_detail"):
+                        record = scrape_post(driver, url)
+                except WebDriverException as e:
+                    logging.error(f"Trình duyệt lỗi khi mở {url}: {e}")
+                    pool.discard(driver)
+                    driver = None
+                    continue
+                except Exception as e:
+                    logging.error(f"Lỗi khi lấy chi tiết {url}: {e}")
+                    continue
+
+                if record is not None:
+                    with lock:
+                        records.append(record)
+                    progress.tick(url)
+        finally:
+            if driver is not None:
+                pool.release(driver)
+
+    workers = max(1, min(concurrency, len(urls)))
+    logging.info(f"Lấy chi tiết {len(urls)} bài viết với {workers} trình duyệt song song")
+    threads = [threading.Thread(target=worker, name=f"detail-{i + 1}") for i in range(workers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    progress.done()
+    return records
+
+
+def main():
+    setup_logging()
+    logging.info("===== TOOL LẤY CHI TIẾT BÀI VIẾT FACEBOOK =====")
+
+    cookie_file_path = "facebook_cookies.txt"
+    concurrency = env_int("DETAIL_CONCURRENCY", 2)
+    limit = env_int("DETAIL_LIMIT", 200)
+    limiter = RateLimiter(env_float("DETAIL_RATE_PER_MINUTE", 30))
+    output_path = os.getenv("DETAIL_OUTPUT", "post_details.csv")
+    # Chỉ upload khi được bật rõ ràng: API chưa nhận diện dòng theo url (xem docstring)
+    upload = os.getenv("DETAIL_UPLOAD", "false").lower() == "true"
+    try:
+        require_parquet_support(output_path)
+    except ImportError as e:
+        logging.error(str(e))
+        return
+
+    seen_index = SeenIndex.from_env()
+    try:
+        urls = load_detail_urls(seen_index, limit)
+    finally:
+        seen_index.close()
+    if not urls:
+        logging.warning("Không có link bài viết nào để lấy chi tiết.")
+        return
+
+    pool = DriverPool(lambda slot: open_session(cookie_file_path, slot), is_alive=is_session_alive)
+    try:
+        records = scrape_details(urls, pool, limiter, concurrency)
+    finally:
+        pool.close()
+    if not records:
+        logging.warning("⚠️ Không lấy được chi tiết bài viết nào.")
+        return
+
+    # Cùng pipeline với rpa_process_data: tương tác, ngày, lưu file rồi upload
+    df = transform(pd.DataFrame(records, columns=DETAIL_COLUMNS), VietnameseDateParser())
+    logging.info(f"Đã lưu chi tiết bài viết vào {save_table(df, output_path)}")
+    if not upload:
+        logging.info("Không cập nhật API (DETAIL_UPLOAD=false): API chưa nhận diện dòng theo url.")
+        return
+
+    # Nhận diện dòng theo url: ID Facebook không phải ID dòng của API
+    upload_index = UploadIndex.from_env(key="url")
+    uploader = RowUploader.from_env(API_URL, upload_index=upload_index, key="url")
+    try:
+        report = uploader.upload(build_payloads(df, key="url"))
+    finally:
+        uploader.close()
+        upload_index.close()
+    logging.info(f"✅ Đã cập nhật {report['updated']} bài viết, bỏ qua {report['unchanged']} bài không đổi.")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    finally:
+        metrics.export_from_env("detail_metrics.json")
@@ -0,0 +1,189 @@
+"""Các đoạn JavaScript chạy trong trang để lấy link bài viết.
+
+Thay vì ``find_elements`` rồi ``get_attribute("href")`` cho từng thẻ ``<a>``
+(mỗi lần là một round-trip WebDriver), mọi việc lọc và loại trùng được làm
+trong trình duyệt và trả về một mảng JSON qua một lần ``execute_script``.
+
+``install_link_observer`` gắn một MutationObserver vào trang để ghi lại link
+bài viết mới xuất hiện vào bộ đệm phía JS; ``drain_post_links`` chỉ lấy phần
+mới đó, nên chi phí mỗi lần cuộn tỉ lệ với nội dung mới chứ không với cả trang.
+
+``prune_harvested_posts`` làm rỗng các bài viết đã lấy link xong và đã cuộn
+qua, giữ bộ nhớ renderer và số node DOM gần như không đổi trên feed dài.
+
+``extract_post_detail`` đọc tác giả, nội dung, dòng tương tác và thời gian
+đăng của trang chi tiết một bài viết trong một lần ``execute_script``.
+"""
+
+# Trả về các link /groups/.../posts/... (đã bỏ query string, không trùng lặp)
+# theo thứ tự xuất hiện trong trang. arguments[0] = true để kèm metadata.
+_EXTRACT_POST_LINKS_JS = """
+const withMeta = arguments[0];
+const seen = new Set();
+const out = [];
+for (const a of document.querySelectorAll('a[href*="/groups/"][href*="/posts/"]')) {
+    const url = a.href.split('?')[0];
+    if (seen.has(url)) continue;
+    seen.add(url);
+    if (withMeta) {
+        const article = a.closest('[role="article"]');
+        out.push({
+            url: url,
+            text: (a.innerText || a.getAttribute('aria-label') || '').trim(),
+            in_article: article !== null,
+        });
+    } else {
+        out.push(url);
+    }
+}
+return out;
+"""
+
+
+# Cài MutationObserver (idempotent). Lần cài đầu quét toàn trang một lần để đưa
+# các link đã có vào bộ đệm; sau đó chỉ xét các node mới chèn / href thay đổi.
+_INSTALL_OBSERVER_JS = """
+if (!window.__rpaLinkObserver) {
+    const SELECTOR = 'a[href*="/groups/"][href*="/posts/"]';
+    window.__rpaLinkBuffer = [];
+    window.__rpaLinkSeen = new Set();
+    const record = (a) => {
+        const href = a.href || '';
+        if (href.indexOf('/groups/') < 0 || href.indexOf('/posts/') < 0) return;
+        const url = href.split('?')[0];
+        if (window.__rpaLinkSeen.has(url)) return;
+        window.__rpaLinkSeen.add(url);
+        window.__rpaLinkBuffer.push(url);
+    };
+    const scan = (node) => {
+        if (node.nodeType !== 1) return;
+        if (node.tagName === 'A') record(node);
+        node.querySelectorAll(SELECTOR).forEach(record);
+    };
+    scan(document.body);
+    window.__rpaLinkObserver = new MutationObserver((mutations) => {
+        for (const m of mutations) {
+            if (m.type === 'attributes') {
+                if (m.target.tagName === 'A') record(m.target);
+            } else {
+                m.addedNodes.forEach(scan);
+            }
+        }
+    });
+    window.__rpaLinkObserver.observe(document.body, {
+        childList: true, subtree: true, attributes: true, attributeFilter: ['href'],
+    });
+}
+"""
+
+# Lấy và làm rỗng bộ đệm; tự cài lại observer nếu trang đã được tải lại.
+_DRAIN_OBSERVER_JS = _INSTALL_OBSERVER_JS + """
+const buffer = window.__rpaLinkBuffer;
+window.__rpaLinkBuffer = [];
+return buffer;
+"""
+
+
+def extract_post_links(driver, with_metadata=False):
+    """Lấy toàn bộ link bài viết trong trang bằng một lần execute_script.
+
+    Trả về list URL, hoặc list dict {url, text, in_article} nếu with_metadata=True.
+    """
+    return driver.execute_script(_EXTRACT_POST_LINKS_JS, with_metadata) or []
+
+
+def install_link_observer(driver):
+    """Gắn MutationObserver ghi link bài viết mới vào bộ đệm trong trang."""
+    driver.execute_script(_INSTALL_OBSERVER_JS)
+
+
+def drain_post_links(driver):
+    """Trả về các link bài viết mới xuất hiện kể từ lần gọi trước (một lần execute_script)."""
+    return driver.execute_script(_DRAIN_OBSERVER_JS) or []
+
+
+# Thay các bài viết đã lấy link và đã cuộn qua xa bằng placeholder rỗng cùng
+# chiều cao, để trang không phình bộ nhớ mà vị trí cuộn / infinite scroll vẫn
+# giữ nguyên. arguments[0] = các link mới lấy được từ lần gọi trước.
+_PRUNE_POSTS_JS = """
+const harvested = window.__rpaHarvested || (window.__rpaHarvested = new Set());
+for (const url of arguments[0]) harvested.add(url);
+const limit = window.scrollY - 2 * window.innerHeight;
+let pruned = 0;
+for (const article of document.querySelectorAll('[role="article"]:not([data-rpa-pruned])')) {
+    if (article.parentElement && article.parentElement.closest('[role="article"]')) continue;
+    const rect = article.getBoundingClientRect();
+    if (rect.bottom + window.scrollY > limit) continue;
+    let done = true;
+    for (const a of article.querySelectorAll('a[href*="/groups/"][href*="/posts/"]')) {
+        if (!harvested.has(a.href.split('?')[0])) { done = false; break; }
+    }
+    if (!done) continue;
+    article.style.height = rect.height + 'px';
+    article.style.overflow = 'hidden';
+    article.replaceChildren();
+    article.setAttribute('data-rpa-pruned', '1');
+    pruned++;
+}
+return pruned;
+"""
+
+
+def prune_harvested_posts(driver, new_links):
+    """Làm rỗng các bài viết đã lấy link và nằm xa phía trên màn hình; trả về số bài đã làm rỗng."""
+    return driver.execute_script(_PRUNE_POSTS_JS, list(new_links)) or 0
+
+
+# Chi tiết bài viết đang mở. arguments[0] = ID bài viết (để nhận ra link thời
+# gian đăng, là link trỏ về chính bài viết). Dòng tương tác được ghép lại theo
+# đúng dạng rpa_process_data đọc: "Tất cả cảm xúc: 12 3 bình luận 1 lượt chia sẻ".
+_EXTRACT_POST_DETAIL_JS = """
+const postId = arguments[0];
+const root = document.querySelector('[role="main"] [role="article"]')
+    || document.querySelector('[role="article"]');
+if (!root) return null;
+const clean = (s) => (s || '').replace(/\\s+/g, ' ').trim();
+
+const authorEl = root.querySelector(
+    'h2 a, h3 a, strong a, a[href*="/user/"], a[href*="/profile.php"]');
+
+const messageEl = root.querySelector('[data-ad-preview="message"], [data-ad-comet-preview="message"]');
+let text = messageEl ? messageEl.innerText : '';
+if (!text) {
+    for (const el of root.querySelectorAll('div[dir="auto"], p')) {
+        if (el.innerText.length > text.length) text = el.innerText;
+    }
+}
+
+const lines = root.innerText.split('\\n').map(clean).filter(Boolean);
+const parts = [];
+for (let i = 0; i < lines.length; i++) {
+    if (lines[i].startsWith('Tất cả cảm xúc')) {
+        parts.push(lines[i]);
+        if (/^\\d+$/.test(lines[i + 1] || '')) parts.push(lines[++i]);
+    } else if (/\\d+\\s*(bình luận|lượt chia sẻ)/.test(lines[i])) {
+        parts.push(lines[i]);
+    }
+}
+
+let date = '';
+for (const a of root.querySelectorAll('a[href*="/posts/"], a[href*="/permalink/"]')) {
+    const label = clean(a.innerText || a.getAttribute('aria-label'));
+    if (!label || label.length > 40 || /bình luận/i.test(label)) continue;
+    if (postId && a.href.indexOf(postId) < 0) continue;
+    date = label;
+    break;
+}
+
+return {
+    author: authorEl ? clean(authorEl.innerText) : '',
+    text: text.trim(),
+    interactions: parts.join(' '),
+    date: date,
+};
+"""
+
+
+def extract_post_detail(driver, post_id=None):
+    """Trả về dict {author, text, interactions, date} của bài viết đang mở, hoặc None."""
+    return driver.execute_script(_EXTRACT_POST_DETAIL_JS, post_id or "")
@@ -0,0 +1,23 @@
+"""Đọc cấu hình từ biến môi trường.
+
+Chỉ dùng thư viện chuẩn để các module nhẹ (logging, cuộn trang, checkpoint...)
+đọc cấu hình mà không kéo theo ``requests`` hay ``selenium`` lúc import.
+"""
+
+import os
+
+
+def env_int(name, default):
+    """Đọc biến môi trường kiểu int, dùng giá trị mặc định nếu thiếu hoặc sai định dạng."""
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def env_float(name, default):
+    """Đọc biến môi trường kiểu float, dùng giá trị mặc định nếu thiếu hoặc sai định dạng."""
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
@@ -0,0 +1,213 @@
+"""Lấy link bài viết qua HTTP thuần từ giao diện mbasic của Facebook, không cần Chrome.
+
+Trang ``mbasic.facebook.com/groups/...`` được render sẵn phía server: mỗi
+trang là HTML tĩnh chứa vài bài viết và một link "Xem thêm bài viết" sang
+trang sau. ``HttpSession`` gửi request bằng ``requests.Session`` với cookie
+đọc từ ``parse_cookie_file``; ``GroupPageParser`` (``html.parser`` của thư
+viện chuẩn) lấy ID bài viết và link trang sau trong một lần đọc HTML.
+
+``crawl_group_http`` có cùng cách gọi và giá trị trả về với
+``get_post_links_from_group`` (truyền ``HttpSession`` thay cho driver), nên
+dùng được với ``DriverPool`` / ``crawl_groups``. Link được chuẩn hóa về dạng
+``https://www.facebook.com/groups/<group>/posts/<id>/`` giống backend Selenium
+để chỉ mục link đã gửi dùng chung được cho cả hai.
+"""
+
+import os
+import re
+import time
+import random
+import logging
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlparse
+
+import requests
+
+from rpa_env import env_float
+from rpa_logging import ProgressLog
+from rpa_metrics import metrics
+from rpa_submit import LinkSubmitter
+
+MBASIC_BASE = "https://mbasic.facebook.com"
+
+# Trình duyệt di động cũ: mbasic trả về HTML gọn, không JavaScript
+_USER_AGENT = (
+    "Mozilla/5.0 (Linux; Android 8.1.0; Nokia 2) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/96.0.4664.104 Mobile Safari/537.36"
+)
+
+_POST_ID_RE = re.compile(r"/groups/[^/?#]+/(?:permalink|posts)/(\d+)|[?&]story_fbid=(\d+)")
+
+_NEXT_PAGE_TEXTS = ("xem thêm bài viết", "see more posts", "xem thêm tin", "see more stories")
+
+
+class GroupPageParser(HTMLParser):
+    """Đọc một trang group mbasic: ID bài viết (theo thứ tự, không trùng) và link trang sau."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.post_ids = []
+        self.next_href = None
+        self.login_required = False
+        self._seen = set()
+        self._href = None
+        self._text = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "a":
+            self._href = dict(attrs).get("href") or ""
+            self._text = []
+            match = _POST_ID_RE.search(self._href)
+            if match:
+                post_id = match.group(1) or match.group(2)
+                if post_id not in self._seen:
+                    self._seen.add(post_id)
+                    self.post_ids.append(post_id)
+        elif tag == "form" and "login" in (dict(attrs).get("action") or ""):
+            # Cookie hết hạn: mbasic trả về form đăng nhập thay vì nội dung group
+            self.login_required = True
+
+    def handle_data(self, data):
+        if self._href is not None:
+            self._text.append(data)
+
+    def handle_endtag(self, tag):
+        if tag != "a" or self._href is None:
+            return
+        text = " ".join("".join(self._text).split()).lower()
+        if self.next_href is None and (text in _NEXT_PAGE_TEXTS or "bacr=" in self._href):
+            self.next_href = self._href
+        self._href = None
+
+
+def parse_group_page(html):
+    """Phân tích HTML một trang group; trả về GroupPageParser đã đọc xong."""
+    parser = GroupPageParser()
+    parser.feed(html)
+    parser.close()
+    return parser
+
+
+class HttpSession:
+    """Phiên HTTP đã gắn cookie Facebook, dùng thay cho driver trong DriverPool."""
+
+    def __init__(self, cookies, timeout=(5, 20)):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": _USER_AGENT, "Accept-Language": "vi-VN,vi;q=0.9"})
+        for cookie in cookies:
+            self.session.cookies.set(
+                cookie["name"],
+                cookie["value"],
+                domain=cookie.get("domain", ".facebook.com"),
+                path=cookie.get("path", "/"),
+            )
+
+    def is_logged_in(self):
+        return any(c.name == "c_user" for c in self.session.cookies)
+
+    def get(self, url):
+        resp = self.session.get(url, timeout=self.timeout)
+        resp.raise_for_status()
+        return resp.text
+
+    def quit(self):
+        self.session.close()
+
+
+def open_http_session(cookies):
+    """Tạo HttpSession từ danh sách cookie của parse_cookie_file, None nếu thiếu cookie đăng nhập."""
+    session = HttpSession(cookies)
+    if not session.is_logged_in():
+        logging.error("Không có cookie c_user hợp lệ, không thể dùng backend HTTP.")
+        session.quit()
+        return None
+    return session
+
+
+def _group_slug(group_url):
+    parts = [p for p in urlparse(group_url).path.split("/") if p]
+    if "groups" in parts and parts.index("groups") + 1 < len(parts):
+        return parts[parts.index("groups") + 1]
+    return parts[-1]
+
+
+def crawl_group_http(
+    session, group_url, max_posts=50, submitter=None, stop_after_seen=0, page_delay=None, checkpoint=None
+):
+    """Duyệt các trang mbasic của group, gửi link bài viết mới qua submitter; trả về số link mới."""
+    own_submitter = submitter is None
+    if own_submitter:
+        submitter = LinkSubmitter.from_env()
+    if page_delay is None:
+        page_delay = env_float("HTTP_PAGE_DELAY", 1.5)
+    try:
+        return _collect_post_links_http(
+            session, group_url, max_posts, submitter, stop_after_seen, page_delay, checkpoint
+        )
+    finally:
+        if own_submitter:
+            submitter.close()
+
+
+def _collect_post_links_http(session, group_url, max_posts, submitter, stop_after_seen, page_delay, checkpoint=None):
+    base = os.getenv("MBASIC_BASE", MBASIC_BASE)
+    slug = _group_slug(group_url)
+    page_url = f"{base}/groups/{slug}"
+
+    # Tiếp tục từ trang kế tiếp đã lưu trong checkpoint (nếu có)
+    collected_links, state = checkpoint.restore(group_url, submitter) if checkpoint else (set(), None)
+    if state and state.get("cursor"):
+        page_url = state["cursor"]
+
+    seen_streak = 0
+    pages = 0
+    failed = False
+    progress = ProgressLog(f"Group {group_url}", total=max_posts)
+    while page_url and len(collected_links) < max_posts:
+        if pages:
+            time.sleep(page_delay * random.uniform(1.0, 1.5))
+        try:
+            with metrics.timer("page_load", backend="http"):
+                page = parse_group_page(session.get(page_url))
+        except requests.exceptions.RequestException as e:
+            logging.error(f"Lỗi khi tải trang group {page_url}: {e}")
+            failed = True
+            break
+        pages += 1
+        if page.login_required:
+            logging.error("mbasic yêu cầu đăng nhập lại, cookie có thể đã hết hạn.")
+            failed = True
+            break
+
+        for post_id in page.post_ids:
+            href_clean = f"https://www.facebook.com/groups/{slug}/posts/{post_id}/"
+            if href_clean in collected_links:
+                continue
+            if submitter.already_sent(href_clean):
+                seen_streak += 1
+                if stop_after_seen and seen_streak >= stop_after_seen:
+                    break
+                continue
+            seen_streak = 0
+            if not submitter.add(href_clean):
+                continue
+            collected_links.add(href_clean)
+            metrics.inc("links_collected")
+            progress.tick(href_clean)
+            if len(collected_links) >= max_posts:
+                break
+
+        if stop_after_seen and seen_streak >= stop_after_seen:
+            logging.info(f"Gặp {seen_streak} bài viết đã gửi liên tiếp, dừng (chế độ incremental).")
+            break
+        page_url = urljoin(base, page.next_href) if page.next_href else None
+        if checkpoint:
+            checkpoint.update(group_url, collected_links, submitter, cursor=page_url)
+
+    # Trang lỗi: giữ checkpoint để lần sau tiếp tục từ trang đó
+    if checkpoint and not failed:
+        checkpoint.mark_done(group_url)
+    progress.done()
+    logging.info(f"Thu thập được {len(collected_links)} link bài viết qua {pages} trang mbasic.")
+    return len(collected_links)
@@ -0,0 +1,210 @@
+"""Crawl nhiều group Facebook song song bằng một nhóm trình duyệt.
+
+Danh sách group lấy từ biến môi trường ``GROUP_URLS`` (phân tách bằng dấu phẩy
+hoặc xuống dòng) hoặc file ``GROUPS_FILE`` (mỗi dòng một URL, dòng bắt đầu
+bằng ``#`` là chú thích). ``crawl_groups`` chạy ``concurrency`` worker, mỗi
+worker mượn một trình duyệt từ ``DriverPool`` và lần lượt lấy group từ hàng
+đợi chung cho tới khi hết; tất cả dùng chung một submitter nên link trùng giữa
+các group chỉ được gửi một lần.
+
+``DriverPool`` giữ các trình duyệt đã đăng nhập sau mỗi lượt crawl để lượt sau
+dùng lại, chỉ kiểm tra nhanh phiên còn sống thay vì khởi động Chrome và đăng
+nhập lại từ đầu.
+
+``RateLimiter`` giới hạn tổng số lượt tải trang mỗi phút của mọi worker cộng lại.
+"""
+
+import os
+import time
+import queue
+import random
+import logging
+import threading
+
+from rpa_metrics import metrics
+
+
+def load_group_urls(default=None):
+    """Đọc danh sách group từ GROUP_URLS hoặc GROUPS_FILE, bỏ trùng, giữ thứ tự."""
+    raw = os.getenv("GROUP_URLS", "")
+    lines = raw.replace(",", "\n").splitlines()
+
+    groups_file = os.getenv("GROUPS_FILE")
+    if groups_file:
+        try:
+            with open(groups_file, "r", encoding="utf-8") as f:
+                lines.extend(f.read().splitlines())
+        except OSError as e:
+            logging.error(f"Không đọc được file danh sách group {groups_file}: {e}")
+
+    urls = []
+    for line in lines:
+        url = line.strip()
+        if url and not url.startswith("#") and url not in urls:
+            urls.append(url)
+    if not urls and default:
+        urls.append(default)
+    return urls
+
+
+class RateLimiter:
+    """Giới hạn tốc độ dùng chung giữa các luồng: tối đa ~per_minute lượt mỗi phút.
+
+    Các lượt được xếp cách nhau 60/per_minute giây (có jitter ±20%) bất kể
+    bao nhiêu worker cùng gọi wait(); per_minute <= 0 là không giới hạn.
+    """
+
+    def __init__(self, per_minute=30):
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Chặn cho tới lượt của luồng hiện tại."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval * random.uniform(0.8, 1.2)
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class DriverPool:
+    """Kho trình duyệt đã đăng nhập, dùng lại giữa các group và các lượt crawl.
+
+    open_session(slot) mở một driver đã đăng nhập (hoặc None nếu thất bại);
+    slot là số thứ tự trình duyệt, dùng để mỗi trình duyệt có profile riêng.
+    is_alive(driver) kiểm tra nhanh driver rảnh còn dùng được trước khi cho mượn.
+    """
+
+    def __init__(self, open_session, is_alive=None):
+        self._open_session = open_session
+        self._is_alive = is_alive
+        self._idle = []
+        self._slots = {}
+        self._free_slots = []
+        self._next_slot = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Mượn một trình duyệt rảnh còn sống, hoặc mở trình duyệt mới."""
+        while True:
+            with self._lock:
+                driver = self._idle.pop() if self._idle else None
+            if driver is None:
+                break
+            if self._is_alive is None or self._is_alive(driver):
+                return driver
+            logging.warning("Phiên trình duyệt không còn hiệu lực, mở lại.")
+            self.discard(driver)
+
+        with self._lock:
+            if self._free_slots:
+                slot = self._free_slots.pop()
+            else:
+                slot = self._next_slot
+                self._next_slot += 1
+        driver = self._open_session(slot)
+        with self._lock:
+            if driver is None:
+                self._free_slots.append(slot)
+            else:
+                self._slots[id(driver)] = slot
+        return driver
+
+    def release(self, driver):
+        """Trả trình duyệt về kho để dùng lại."""
+        with self._lock:
+            self._idle.append(driver)
+
+    def discard(self, driver):
+        """Đóng hẳn một trình duyệt (ví dụ đã treo hoặc hết phiên đăng nhập)."""
+        with self._lock:
+            slot = self._slots.pop(id(driver), None)
+            if slot is not None:
+                self._free_slots.append(slot)
+        try:
+            driver.quit()
+            logging.info("Đã đóng trình duyệt.")
+        except Exception as e:
+            logging.error(f"Lỗi khi đóng trình duyệt: {e}")
+
+    def close(self):
+        """Đóng mọi trình duyệt đang rảnh trong kho."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            self.discard(driver)
+
+
+def crawl_groups(group_urls, pool, crawl, concurrency=1):
+    """Crawl các group bằng tối đa ``concurrency`` trình duyệt chạy song song.
+
+    pool là một DriverPool; crawl(driver, group_url) trả về số link mới thu
+    thập được. Trình duyệt được trả về pool sau khi xong, không bị đóng; nếu
+    crawl lỗi, trình duyệt được kiểm tra lại trước khi dùng cho group tiếp. Trả
+    về danh sách dict {group_url, links, seconds, ok} theo thứ tự hoàn thành.
+    """
+    if not group_urls:
+        logging.warning("Không có group nào để crawl.")
+        return []
+
+    jobs = queue.Queue()
+    for url in group_urls:
+        jobs.put(url)
+
+    results = []
+    lock = threading.Lock()
+
+    def worker():
+        driver = None
+        try:
+            while True:
+                try:
+                    group_url = jobs.get_nowait()
+                except queue.Empty:
+                    return
+
+                # Chỉ mượn trình duyệt khi thực sự còn group cần crawl
+                if driver is None:
+                    driver = pool.acquire()
+                    if driver is None:
+                        jobs.put(group_url)
+                        logging.error("Không mở được phiên trình duyệt đã đăng nhập, worker dừng.")
+                        return
+
+                started = time.monotonic()
+                try:
+                    links = crawl(driver, group_url) or 0
+                    ok = True
+                except Exception as e:
+                    logging.error(f"Lỗi khi crawl group {group_url}: {e}")
+                    links, ok = 0, False
+                    # Trả trình duyệt về pool để lần acquire sau kiểm tra is_alive
+                    # (trình duyệt đã chết bị đóng và thay bằng trình duyệt mới)
+                    pool.release(driver)
+                    driver = None
+                elapsed = time.monotonic() - started
+                metrics.observe("group_crawl", elapsed, ok=ok)
+
+                rate = links / elapsed * 60 if elapsed > 0 else 0
+                logging.info(f"Group {group_url}: {links} link trong {elapsed:.1f}s ({rate:.1f} link/phút)")
+                with lock:
+                    results.append({"group_url": group_url, "links": links, "seconds": round(elapsed, 1), "ok": ok})
+        finally:
+            if driver is not None:
+                pool.release(driver)
+
+    workers = max(1, min(concurrency, len(group_urls)))
+    logging.info(f"Crawl {len(group_urls)} group với {workers} trình duyệt song song")
+    threads = [threading.Thread(target=worker, name=f"crawl-{i + 1}") for i in range(workers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    if not jobs.empty():
+        logging.error(f"Còn {jobs.qsize()} group chưa được crawl do không mở được phiên trình duyệt.")
+    total = sum(r["links"] for r in results)
+    logging.info(f"Hoàn thành {len(results)}/{len(group_urls)} group, tổng cộng {total} link mới.")
+    return results
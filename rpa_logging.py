@@ -0,0 +1,119 @@
+"""Cấu hình logging dùng chung cho các script: ghi log qua hàng đợi, file log xoay vòng.
+
+``setup_logging`` thay các handler của root logger bằng một ``QueueHandler``:
+luồng đang crawl chỉ đưa bản ghi vào hàng đợi trong bộ nhớ, còn việc ghi ra
+file/console do một ``QueueListener`` chạy nền đảm nhận, nên vòng lặp cuộn
+không bao giờ bị chặn vì I/O đĩa. File log là ``RotatingFileHandler`` (mặc
+định 5 MB x 3 bản) thay vì phình ra mãi giữa các lần chạy.
+
+Biến môi trường: ``LOG_LEVEL`` (mặc định INFO; DEBUG để xem từng link; giá trị không hợp lệ
+được thay bằng INFO kèm cảnh báo),
+``LOG_FILE``, ``LOG_MAX_BYTES``, ``LOG_BACKUP_COUNT``.
+
+``ProgressLog`` gom các sự kiện lặp lại theo từng link (đã thu thập, đã lấy chi
+tiết...) thành một dòng INFO tổng kết mỗi ``interval`` giây; chi tiết từng link
+chỉ ghi ở mức DEBUG.
+"""
+
+import os
+import time
+import queue
+import atexit
+import logging
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+from rpa_env import env_float, env_int
+
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+DEFAULT_LOG_FILE = "facebook_scraper.log"
+
+_listener = None
+
+
+def setup_logging(log_file=DEFAULT_LOG_FILE):
+    """Cấu hình root logger ghi qua hàng đợi ra console và (nếu có log_file) file xoay vòng.
+
+    Gọi nhiều lần chỉ có tác dụng ở lần đầu. log_file=None: chỉ ghi ra console.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [logging.StreamHandler()]
+    log_file = os.getenv("LOG_FILE", log_file)
+    if log_file:
+        handlers.append(
+            RotatingFileHandler(
+                log_file,
+                maxBytes=env_int("LOG_MAX_BYTES", 5 * 1024 * 1024),
+                backupCount=env_int("LOG_BACKUP_COUNT", 3),
+                encoding="utf-8",
+            )
+        )
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(QueueHandler(log_queue))
+    level = os.getenv("LOG_LEVEL", "INFO").upper()
+    valid_level = level in logging.getLevelNamesMapping()
+    root.setLevel(level if valid_level else logging.INFO)
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    if not valid_level:
+        logging.warning(f"LOG_LEVEL={level} không hợp lệ, dùng INFO.")
+    # Ghi nốt các bản ghi còn trong hàng đợi khi tiến trình kết thúc
+    atexit.register(stop_logging)
+
+
+def stop_logging():
+    """Dừng luồng ghi log nền sau khi ghi hết hàng đợi."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+class ProgressLog:
+    """Đếm sự kiện lặp lại và ghi một dòng tổng kết mỗi interval giây thay vì mỗi sự kiện một dòng."""
+
+    def __init__(self, label, total=None, unit="link", interval=None):
+        self.label = label
+        self.total = total
+        self.unit = unit
+        self.interval = env_float("LOG_PROGRESS_SECONDS", 30) if interval is None else interval
+        self.count = 0
+        self._lock = threading.Lock()
+        self._started = self._last = time.monotonic()
+        self._last_count = 0
+
+    def tick(self, detail=None, n=1):
+        """Ghi nhận n sự kiện; detail (ví dụ URL) chỉ được ghi ở mức DEBUG."""
+        with self._lock:
+            self.count += n
+            count = self.count
+            now = time.monotonic()
+            due = now - self._last >= self.interval
+            if due:
+                recent, window = count - self._last_count, now - self._last
+                self._last, self._last_count = now, count
+        if detail is not None:
+            logging.debug(f"{self.label}: {self.unit} thứ {count}: {detail}")
+        if due:
+            rate = recent / window * 60 if window > 0 else 0
+            logging.info(f"{self.label}: {self._progress(count)} (+{recent} trong {window:.0f}s, {rate:.1f} {self.unit}/phút)")
+
+    def done(self):
+        """Ghi dòng tổng kết cuối cùng."""
+        elapsed = time.monotonic() - self._started
+        rate = self.count / elapsed * 60 if elapsed > 0 else 0
+        logging.info(f"{self.label}: {self._progress(self.count)} trong {elapsed:.1f}s ({rate:.1f} {self.unit}/phút)")
+
+    def _progress(self, count):
+        return f"{count}/{self.total} {self.unit}" if self.total else f"{count} {self.unit}"
@@ -0,0 +1,225 @@
+"""Đo thời gian từng giai đoạn của một lần chạy và xuất ra JSON / Prometheus textfile.
+
+Các module gọi thẳng vào bộ đếm dùng chung ``metrics`` (an toàn giữa các luồng)::
+
+    from rpa_metrics import metrics
+
+    with metrics.timer("page_load", backend="selenium"):
+        driver.get(group_url)
+    metrics.inc("links_collected")
+
+``timer`` / ``observe`` ghi thời gian (giây) vào histogram theo tên và nhãn;
+``inc`` cộng bộ đếm. Cuối lần chạy ``export_from_env`` ghi bản tóm tắt JSON
+(``METRICS_JSON``: số lần, tổng, trung bình, p50/p95/max của mỗi giai đoạn và
+giá trị các bộ đếm) và, nếu có ``METRICS_PROM_FILE``, file textfile cho
+node_exporter để theo dõi/cảnh báo khi job chạy chậm đi.
+
+Các giai đoạn đang được đo:
+
+- ``driver_startup``, ``login``: mở Chrome và đăng nhập;
+- ``page_load``: tải trang group (nhãn ``backend``);
+- ``scroll`` (nhãn ``reason``), ``extract`` (nhãn ``mode``): mỗi vòng cuộn/lấy link;
+- ``group_crawl``: toàn bộ một group (nhãn ``ok``);
+- ``api_request``: mỗi lần gửi HTTP tới API (nhãn ``method``, ``status``), cùng
+  bộ đếm ``api_retries`` và ``api_circuit_open``;
+- ``submit_batch``: mỗi lô link gửi lên API (nhãn ``mode``);
+- ``post_detail``: mở và trích xuất một bài viết (``rpa_detail``).
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime
+
+# Giới hạn trên (giây) của các bucket histogram
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+_PROM_PREFIX = "rpa_"
+
+
+class Histogram:
+    """Phân bố thời gian của một chuỗi đo: số lần, tổng, min/max và số đếm theo bucket."""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # phần tử cuối: > bucket lớn nhất
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def quantile(self, q):
+        """Ước lượng phân vị q từ bucket (nội suy tuyến tính trong bucket chứa nó)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                estimate = lower + (upper - lower) * (rank - seen) / n
+                return min(max(estimate, self.min), self.max)
+            seen += n
+        return self.max
+
+
+def _label_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _prom_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    inner = ",".join(
+        f'{k}="' + str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"' for k, v in pairs
+    )
+    return "{" + inner + "}"
+
+
+def _write_atomic(path, text):
+    # node_exporter có thể đọc file bất cứ lúc nào: ghi file tạm rồi đổi tên
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+class Metrics:
+    """Bộ đếm và histogram thời gian theo (tên, nhãn), dùng chung giữa các luồng."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Xóa mọi số đo và đặt lại thời điểm bắt đầu lần chạy."""
+        with self._lock:
+            self._histograms = {}
+            self._counters = {}
+            self.started_at = datetime.now()
+            self._started = time.monotonic()
+
+    def observe(self, name, seconds, **labels):
+        """Ghi một lần đo thời gian (giây) cho giai đoạn name."""
+        key = (name, _label_key(labels))
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = Histogram(self.buckets)
+            hist.observe(seconds)
+
+    def inc(self, name, value=1, **labels):
+        """Cộng value vào bộ đếm name."""
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """Đo thời gian khối lệnh bên trong (kể cả khi có exception)."""
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.observe(name, time.monotonic() - started, **labels)
+
+    def summary(self):
+        """Tóm tắt lần chạy dạng dict, sẵn sàng để ghi JSON."""
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+            duration = time.monotonic() - self._started
+
+        def rounded(value):
+            return None if value is None else round(value, 4)
+
+        return {
+            "started_at": self.started_at.strftime("%Y-%m-%d %H:%M:%S"),
+            "duration_seconds": round(duration, 2),
+            "timers": [
+                {
+                    "name": name,
+                    "labels": dict(key),
+                    "count": hist.count,
+                    "total_seconds": round(hist.sum, 3),
+                    "avg_seconds": rounded(hist.sum / hist.count),
+                    "p50_seconds": rounded(hist.quantile(0.5)),
+                    "p95_seconds": rounded(hist.quantile(0.95)),
+                    "max_seconds": rounded(hist.max),
+                }
+                for (name, key), hist in histograms
+            ],
+            "counters": [
+                {"name": name, "labels": dict(key), "value": value} for (name, key), value in counters
+            ],
+        }
+
+    def prometheus_text(self):
+        """Số đo theo định dạng text exposition của Prometheus."""
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+            duration = time.monotonic() - self._started
+
+        lines = [
+            f"# TYPE {_PROM_PREFIX}run_start_timestamp_seconds gauge",
+            f"{_PROM_PREFIX}run_start_timestamp_seconds {self.started_at.timestamp():.0f}",
+            f"# TYPE {_PROM_PREFIX}run_duration_seconds gauge",
+            f"{_PROM_PREFIX}run_duration_seconds {duration:.3f}",
+        ]
+        typed = set()
+        for (name, key), hist in histograms:
+            metric = f"{_PROM_PREFIX}{name}_seconds"
+            if metric not in typed:
+                typed.add(metric)
+                lines.append(f"# TYPE {metric} histogram")
+            cumulative = 0
+            for bound, n in zip(self.buckets, hist.counts):
+                cumulative += n
+                lines.append(f"{metric}_bucket{_prom_labels(key, [('le', bound)])} {cumulative}")
+            lines.append(f"{metric}_bucket{_prom_labels(key, [('le', '+Inf')])} {hist.count}")
+            lines.append(f"{metric}_sum{_prom_labels(key)} {hist.sum:.6f}")
+            lines.append(f"{metric}_count{_prom_labels(key)} {hist.count}")
+        for (name, key), value in counters:
+            metric = f"{_PROM_PREFIX}{name}_total"
+            if metric not in typed:
+                typed.add(metric)
+                lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric}{_prom_labels(key)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path):
+        _write_atomic(path, json.dumps(self.summary(), ensure_ascii=False, indent=2) + "\n")
+
+    def write_prometheus(self, path):
+        _write_atomic(path, self.prometheus_text())
+
+    def export_from_env(self, default_json="run_metrics.json"):
+        """Ghi tóm tắt JSON (METRICS_JSON, rỗng để tắt) và textfile Prometheus (METRICS_PROM_FILE)."""
+        json_path = os.getenv("METRICS_JSON", default_json)
+        prom_path = os.getenv("METRICS_PROM_FILE")
+        try:
+            if json_path:
+                self.write_json(json_path)
+                logging.info(f"Đã ghi số đo thời gian của lần chạy vào {json_path}")
+            if prom_path:
+                self.write_prometheus(prom_path)
+        except OSError as e:
+            logging.error(f"Không ghi được file số đo: {e}")
+
+
+metrics = Metrics()
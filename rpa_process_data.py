@@ -1,11 +1,14 @@
-import requests
+import os
+import numpy as np
 import pandas as pd
 import re
+import logging
 from datetime import datetime, timedelta
 
-with open(r"C:\Users\Administrator\Desktop\Crawl\log.txt", "a") as f:
-    f.write(f"Script ran at {datetime.now()}\n")
-    api_url = "http://api.rpa4edu.shop/api_bai_viet.php"
+from rpa_env import env_int
+from rpa_logging import ProgressLog, setup_logging
+from rpa_upload import API_URL, DEFAULT_KEY, PAYLOAD_COLUMNS, RowUploader, processed_path
+from rpa_upload_index import UploadIndex
 
 def process_data(text):
     # Initialize default values
@@ -35,96 +38,430 @@ def process_data(text):
     return likes, comments, shares
 
 
-def parse_vietnamese_date(text, current_time=None):
-    if current_time is None:
-        current_time = datetime.now()
+_HEADER_TEXTS = ['Thích', 'Bình luận', 'Sao chép', 'Chia sẻ']
 
-    # Kiểm tra đầu vào hợp lệ
-    if not isinstance(text, str):
-        return None
+# Ba lookahead độc lập trên cùng một chuỗi, mỗi cái tương đương một re.search
+# trong process_data (lấy kết quả khớp đầu tiên), gộp thành một lần str.extract
+_METRICS_PATTERN = (
+    r'(?s)^'
+    r'(?=(?:.*?Tất cả cảm xúc:\s*(?P<LIKE>\d+))?)'
+    r'(?=(?:.*?(?P<COMMENT>\d+)\s*bình luận)?)'
+    r'(?=(?:.*?(?P<SHARE>\d+)\s*lượt chia sẻ)?)'
+)
 
-    text = text.lower().strip()
 
-    # 1. Kiểu "11 giò" hoặc "9 giò"
-    match = re.search(r'(\d+)\s*gi[òo]', text)
-    if match:
-        hours_ago = int(match.group(1))
-        dt = current_time - timedelta(hours=hours_ago)
-        return dt.strftime('%Y-%m-%d %H:%M:%S')
+def extract_metrics(texts):
+    """Bản vector hóa của process_data cho cả cột.
+
+    Trả về DataFrame các cột LIKE, COMMENT, SHARE (float, NaN nếu không có),
+    cùng index với texts.
+    """
+    texts = texts.astype(str)
+    metrics = texts.str.extract(_METRICS_PATTERN).astype(float)
+    metrics.loc[texts.isin(_HEADER_TEXTS)] = float('nan')
+    return metrics
 
-    # 2. Kiểu "5 tháng 6 lúc 15:37"
-    match = re.search(r'(\d{1,2}) tháng (\d{1,2}) lúc (\d{1,2}):(\d{2})', text)
-    if match:
-        day, month, hour, minute = map(int, match.groups())
-        year = current_time.year
-        dt = datetime(year, month, day, hour, minute)
-        return dt.strftime('%Y-%m-%d %H:%M:%S')
 
-    # 3. Kiểu "19 tháng 11, 2024"
-    match = re.search(r'(\d{1,2}) tháng (\d{1,2}),?\s*(\d{4})', text)
+# Thời gian tương đối: "5 phút", "11 giờ" (cả "giò" do lỗi font), "3 ngày"
+_RELATIVE_RE = re.compile(r'(\d+)\s*(phút|gi[ờòo]|ngày)')
+_RELATIVE_UNITS = {'phút': 'minutes', 'ngày': 'days'}
+
+# "Hôm qua" hoặc "Hôm qua lúc 10:05"
+_YESTERDAY_RE = re.compile(r'hôm qua(?:\s*lúc\s*(\d{1,2}):(\d{2}))?')
+
+# Ngày tháng gộp một pattern: "5 tháng 6 lúc 15:37", "19 tháng 11, 2024",
+# hoặc chỉ ngày & tháng ("Người tham gia ẩn danh 5 tháng 1")
+_DAY_MONTH_RE = re.compile(
+    r'(\d{1,2}) tháng (\d{1,2})(?: lúc (\d{1,2}):(\d{2})|,?\s*(\d{4}))?'
+)
+
+
+def _parse_date(text, current_time):
+    """Chuyển một chuỗi ngày của Facebook thành datetime, None nếu không nhận ra."""
+    text = text.lower().strip()
+
+    # 1. Kiểu "11 giờ", "5 phút", "3 ngày"
+    match = _RELATIVE_RE.search(text)
     if match:
-        day, month, year = map(int, match.groups())
-        dt = datetime(year, month, day)
-        return dt.strftime('%Y-%m-%d %H:%M:%S')
+        amount = int(match.group(1))
+        unit = _RELATIVE_UNITS.get(match.group(2), 'hours')
+        return current_time - timedelta(**{unit: amount})
 
-    # ✅ 4. Kiểu "Nguòi tham gia án danh 5 tháng 1" → chỉ ngày & tháng
-    match = re.search(r'(\d{1,2}) tháng (\d{1,2})', text)
+    # 2. Kiểu "Hôm qua lúc 10:05"
+    match = _YESTERDAY_RE.search(text)
+    if match:
+        dt = current_time - timedelta(days=1)
+        if match.group(1):
+            try:
+                dt = dt.replace(hour=int(match.group(1)), minute=int(match.group(2)), second=0, microsecond=0)
+            except ValueError:
+                return None
+        return dt
+
+    # 3. Kiểu "5 tháng 6 lúc 15:37", "19 tháng 11, 2024", "5 tháng 1"
+    match = _DAY_MONTH_RE.search(text)
     if match:
-        day, month = map(int, match.groups())
-        year = current_time.year
+        day, month, hour, minute, year = match.groups()
         try:
-            dt = datetime(year, month, day)
-            return dt.strftime('%Y-%m-%d %H:%M:%S')
+            return datetime(
+                int(year) if year else current_time.year,
+                int(month),
+                int(day),
+                int(hour or 0),
+                int(minute or 0),
+            )
         except ValueError:
             return None
 
     return None
 
 
+class VietnameseDateParser:
+    """Chuẩn hóa ngày tiếng Việt theo lô với một mốc thời gian cố định.
+
+    Mọi giá trị tương đối ("5 giờ", "Hôm qua") trong cùng một parser đều tính
+    từ cùng current_time nên kết quả không bị trôi giữa các dòng. Mỗi chuỗi
+    khác nhau chỉ được parse một lần; dùng lại parser cho nhiều lô (ví dụ đọc
+    file theo chunk) để tận dụng cache.
+    """
+
+    def __init__(self, current_time=None, max_cache=100000):
+        self.current_time = current_time or datetime.now()
+        self.max_cache = max_cache
+        self._cache = {}
+
+    def parse(self, text):
+        """Parse một giá trị, trả về datetime hoặc None."""
+        if not isinstance(text, str):
+            return None
+        try:
+            return self._cache[text]
+        except KeyError:
+            pass
+        if len(self._cache) >= self.max_cache:
+            # Giữ bộ nhớ có giới hạn khi xử lý file rất lớn theo chunk
+            self._cache.clear()
+        dt = self._cache[text] = _parse_date(text, self.current_time)
+        return dt
+
+    def parse_series(self, values):
+        """Parse cả cột, trả về Series datetime64 (NaT nếu không nhận ra)."""
+        values = pd.Series(values)
+        parsed = {value: self.parse(value) for value in values.dropna().unique()}
+        return pd.to_datetime(values.map(parsed), errors='coerce')
+
+
+def parse_vietnamese_dates(values, current_time=None):
+    """Chuẩn hóa cả cột ngày tiếng Việt thành datetime64 với một mốc thời gian chung."""
+    return VietnameseDateParser(current_time).parse_series(values)
+
+
+def parse_vietnamese_date(text, current_time=None):
+    if current_time is None:
+        current_time = datetime.now()
+
+    # Kiểm tra đầu vào hợp lệ
+    if not isinstance(text, str):
+        return None
+
+    dt = _parse_date(text, current_time)
+    return dt.strftime('%Y-%m-%d %H:%M:%S') if dt is not None else None
+
+
+def _json_value(v):
+    # Timestamp và số kiểu numpy không đi qua được json.dumps của requests
+    if pd.isna(v):
+        return ""
+    if isinstance(v, (pd.Timestamp, datetime)):
+        return v.strftime('%Y-%m-%d %H:%M:%S')
+    if isinstance(v, np.generic):
+        return v.item()
+    return v
+
+
 def clean_nan_values(record):
-    return {k: ("" if pd.isna(v) else v) for k, v in record.items()}
+    return {k: _json_value(v) for k, v in record.items()}
 
 
-def main():
-    # Read the Excel file
+# Kiểu cố định theo vị trí cột (bố cục crawled.xlsx), giống nhau ở mọi chunk:
+# nếu để pandas tự đoán theo dữ liệu từng chunk, cột số có ô trống thành float
+# và 2 được ghi thành 2.0 ở chunk này nhưng 2 ở chunk khác
+INT_COLUMNS = (0, 3, 4, 5, 10, 11, 12)  # ID, LIKE, SHARE, COMMENT, ĐÃ XÓA, ĐÃ THU THẬP ĐƯỢC, TYPE
+TEXT_COLUMNS = (1, 2, 6, 7, 8)  # NỘI DUNG, TÁC GIẢ, Tổng tương tác, DATE, TGIAN CHUẨN
+
+
+def as_int(values):
+    """Cột số nguyên cho phép trống (Int64); giá trị không phải số thành trống."""
     try:
-        df = pd.read_excel(r"C:\Users\Administrator\Desktop\Crawl\crawled.xlsx")
-    except FileNotFoundError:
-        print("Không tìm thấy file crawled.xlsx")
-        return
+        return values.astype('Int64')
+    except (TypeError, ValueError):
+        pass
+    numbers = pd.to_numeric(values, errors='coerce')
+    try:
+        return numbers.astype('Int64')
+    except (TypeError, ValueError):
+        # Có giá trị lẻ: giữ float thay vì làm tròn
+        return numbers
+
+
+def as_text(values):
+    """Cột chuỗi (string), ô trống là <NA>."""
+    return values.astype('string')
+
+
+def fix_dtypes(df):
+    """Ép các cột theo INT_COLUMNS/TEXT_COLUMNS về kiểu cố định (bỏ qua cột không có)."""
+    for positions, cast in ((INT_COLUMNS, as_int), (TEXT_COLUMNS, as_text)):
+        for pos in positions:
+            if pos < df.shape[1]:
+                df[df.columns[pos]] = cast(df.iloc[:, pos])
+    return df
+
+
+_PAYLOAD_CASTS = {'int': as_int, 'text': as_text}
+
+
+def build_payloads(df, modified_time=None, key=DEFAULT_KEY):
+    """Tạo payload cập nhật API cho mọi dòng có khóa bằng một lần to_dict('records').
+
+    key='url': dòng từ bước lấy chi tiết (rpa_detail) được nhận diện bằng cột
+    URL; ID bài viết Facebook ở cột đầu không phải ID dòng của API nên được gửi
+    dạng chuỗi trong post_id thay vì id_bai_viet.
+    """
+    if modified_time is None:
+        modified_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    rows = df.iloc[:, [pos for _, pos, _ in PAYLOAD_COLUMNS]].set_axis(
+        [name for name, _, _ in PAYLOAD_COLUMNS], axis=1
+    )
+    # Cùng kiểu giá trị ở mọi chunk và khi đọc lại từ CSV (rpa_upload.read_payloads_csv)
+    for name, _, kind in PAYLOAD_COLUMNS:
+        if kind in _PAYLOAD_CASTS:
+            rows[name] = _PAYLOAD_CASTS[kind](rows[name])
+
+    # File từ bước lấy chi tiết (rpa_detail) có thêm cột URL bài viết
+    if 'URL' in df.columns:
+        rows = rows.assign(url=df['URL'])
+    if key == 'url':
+        if 'URL' not in df.columns:
+            raise ValueError("Không có cột URL để nhận diện dòng theo url")
+        rows = rows.rename(columns={'id_bai_viet': 'post_id'})
+        rows['post_id'] = as_text(rows['post_id'])
+
+    missing = rows[key].isna()
+    for index in rows.index[missing]:  # Nếu khóa bị NaN
+        logging.warning(f"⚠️ Bỏ qua dòng {index} vì thiếu {'ID' if key == DEFAULT_KEY else key}")
+
+    payloads = []
+    for record in rows[~missing].to_dict('records'):
+        # Loại bỏ NaN
+        record = clean_nan_values(record)
+        record['modified_time'] = modified_time
+        payloads.append(record)
+    return payloads
 
-    # Process data for likes, comments, and shares
-    for index, text in enumerate(df.iloc[:, 6]):  # Process column 6
-        likes, comments, shares = process_data(str(text))
 
-        # Update the existing columns
-        df.at[index, 'LIKE'] = likes
-        df.at[index, 'SHARE'] = shares
-        df.at[index, 'COMMENT'] = comments
+# Định dạng thời gian thống nhất cho file CSV, không phụ thuộc dữ liệu từng chunk
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
 
-    # Check and rename DATE column if needed
-    if 'DATE' not in df.columns and df.shape[1] >= 8:
-        column_name = df.columns[7]
-        print(f"Không tìm thấy cột 'DATE', sử dụng cột '{column_name}' ở vị trí H")
-        df.rename(columns={column_name: 'DATE'}, inplace=True)
-    elif 'DATE' not in df.columns:
-        print("Không tìm thấy cột DATE trong file Excel")
+
+def write_csv(df, out, header=True):
+    """Ghi DataFrame vào file CSV out (đã mở bằng open_csv) theo định dạng chung của file kết quả."""
+    df.to_csv(out, header=header, index=False, date_format=DATE_FORMAT)
+
+
+def open_csv(path):
+    """Mở file CSV kết quả để ghi; utf-8-sig để Excel trên Windows mở đúng tiếng Việt."""
+    return open(path, 'w', encoding='utf-8-sig', newline='')
+
+
+def require_parquet_support(path):
+    """Báo lỗi rõ ràng nếu path là file .parquet mà chưa cài pyarrow.
+
+    pyarrow không có trong requirements.txt; mặc định mọi file kết quả là CSV.
+    """
+    if not path.lower().endswith('.parquet'):
         return
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise ImportError(
+            f"Đọc/ghi file Parquet {path} cần pyarrow (pip install pyarrow), hoặc dùng file .csv"
+        ) from None
+
+
+def load_table(path):
+    """Đọc file đầu vào theo phần mở rộng: .parquet (cần pyarrow), .csv hoặc Excel."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.parquet':
+        require_parquet_support(path)
+        return pd.read_parquet(path)
+    if ext == '.csv':
+        return pd.read_csv(path)
+    return pd.read_excel(path)
+
+
+def save_table(df, path):
+    """Ghi DataFrame ra CSV, hoặc Parquet nếu path có đuôi .parquet (cần pyarrow,
+    ImportError nếu chưa cài). Dữ liệu không ghi được dạng cột thì ghi CSV thay
+    thế. Trả về đường dẫn thực sự đã ghi."""
+    if path.lower().endswith('.parquet'):
+        require_parquet_support(path)
+        try:
+            df.rename(columns=str).to_parquet(path, index=False)
+            return path
+        except (ValueError, TypeError) as e:
+            path = os.path.splitext(path)[0] + '.csv'
+            logging.warning(f"Không ghi được Parquet ({e}), chuyển sang CSV: {path}")
+    with open_csv(path) as out:
+        write_csv(df, out)
+    return path
+
+
+def find_date_column(df):
+    """Tên cột ngày đăng: 'DATE', hoặc cột ở vị trí H nếu file không có tên đó."""
+    if 'DATE' in df.columns:
+        return 'DATE'
+    if df.shape[1] >= 8:
+        return df.columns[7]
+    return None
+
+
+def transform(df, date_parser, date_column='DATE'):
+    """Tính LIKE/SHARE/COMMENT và DATE CONVERTED cho cả file hoặc một chunk.
 
-    # Create DATE CONVERTED column if it doesn't exist
-    if 'DATE CONVERTED' not in df.columns:
-        df['DATE CONVERTED'] = None
+    Các cột trong INT_COLUMNS/TEXT_COLUMNS luôn có cùng kiểu (fix_dtypes), nên
+    kết quả không phụ thuộc cách chia chunk.
+    """
+    # Process data for likes, comments, and shares (column 6)
+    metrics = extract_metrics(df.iloc[:, 6])
 
-    # Convert dates
-    df['DATE CONVERTED'] = df['DATE'].apply(parse_vietnamese_date)
+    # Update the existing columns
+    df['LIKE'] = metrics['LIKE']
+    df['SHARE'] = metrics['SHARE']
+    df['COMMENT'] = metrics['COMMENT']
 
-    # Save back to the same Excel file
+    if date_column != 'DATE':
+        df = df.rename(columns={date_column: 'DATE'})
+
+    # Convert dates (một mốc thời gian chung cho mọi chunk)
+    df['DATE CONVERTED'] = date_parser.parse_series(df['DATE'])
+    return fix_dtypes(df)
+
+
+def _iter_excel_chunks(path, chunk_size):
+    # openpyxl read-only đọc từng dòng, không nạp cả workbook vào bộ nhớ
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [f"Unnamed: {i}" if name is None else name for i, name in enumerate(header)]
+        width = len(columns)
+
+        offset, batch = 0, []
+        for row in rows:
+            if all(v is None for v in row):
+                continue
+            batch.append(tuple(row[:width]) + (None,) * (width - len(row)))
+            if len(batch) >= chunk_size:
+                yield pd.DataFrame(batch, columns=columns, index=pd.RangeIndex(offset, offset + len(batch)))
+                offset, batch = offset + len(batch), []
+        if batch:
+            yield pd.DataFrame(batch, columns=columns, index=pd.RangeIndex(offset, offset + len(batch)))
+    finally:
+        wb.close()
+
+
+def iter_table_chunks(path, chunk_size):
+    """Đọc file đầu vào theo từng chunk chunk_size dòng (.csv, .parquet hoặc Excel)."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.csv':
+        yield from pd.read_csv(path, chunksize=chunk_size)
+    elif ext == '.parquet':
+        require_parquet_support(path)
+        import pyarrow.parquet as pq
+
+        offset = 0
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            chunk = batch.to_pandas()
+            chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+            offset += len(chunk)
+            yield chunk
+    else:
+        yield from _iter_excel_chunks(path, chunk_size)
+
+
+def _merge_reports(total, report):
+    if total is None:
+        return dict(report, failed_rows=list(report['failed_rows']))
+    for key in ('rows', 'unchanged', 'updated', 'failed', 'batches'):
+        total[key] += report[key]
+    total['failed_rows'].extend(report['failed_rows'])
+    return total
+
+
+def process_stream(input_path, output_path, chunk_size, uploader=None, date_parser=None):
+    """Xử lý file theo từng chunk mà không giữ cả bảng trong bộ nhớ.
+
+    Mỗi chunk được transform, ghi nối tiếp ra file kết quả rồi upload ngay.
+    Parquet cần schema cố định giữa các chunk nên chế độ này luôn ghi CSV
+    (đuôi .parquet được đổi thành .csv). Trả về dict {rows, chunks, output,
+    upload}, trong đó upload là báo cáo gộp của uploader (None nếu không upload).
+    """
+    date_parser = date_parser or VietnameseDateParser()
+    modified_time = date_parser.current_time.strftime('%Y-%m-%d %H:%M:%S')
+    if output_path.lower().endswith('.parquet'):
+        output_path = os.path.splitext(output_path)[0] + '.csv'
+
+    stats = {'rows': 0, 'chunks': 0, 'output': output_path, 'upload': None}
+    progress = ProgressLog("Xử lý dữ liệu", unit="dòng")
+    date_column = None
+    with open_csv(output_path) as out:
+        for chunk in iter_table_chunks(input_path, chunk_size):
+            if date_column is None:
+                date_column = find_date_column(chunk)
+                if date_column is None:
+                    logging.error("Không tìm thấy cột DATE trong file đầu vào")
+                    break
+                if date_column != 'DATE':
+                    logging.warning(f"Không tìm thấy cột 'DATE', sử dụng cột '{date_column}' ở vị trí H")
+
+            chunk = transform(chunk, date_parser, date_column)
+            write_csv(chunk, out, header=stats['chunks'] == 0)
+            if uploader is not None:
+                stats['upload'] = _merge_reports(stats['upload'], uploader.upload(build_payloads(chunk, modified_time)))
+
+            stats['rows'] += len(chunk)
+            stats['chunks'] += 1
+            progress.tick(n=len(chunk))
+    progress.done()
+    return stats
+
+
+def process_file(input_path, output_path, date_parser=None):
+    """Xử lý cả file trong bộ nhớ, lưu kết quả; trả về DataFrame hoặc None nếu lỗi."""
+    df = load_table(input_path)
+
+    # Check and rename DATE column if needed
+    date_column = find_date_column(df)
+    if date_column is None:
+        logging.error("Không tìm thấy cột DATE trong file đầu vào")
+        return None
+    if date_column != 'DATE':
+        logging.warning(f"Không tìm thấy cột 'DATE', sử dụng cột '{date_column}' ở vị trí H")
+
+    df = transform(df, date_parser or VietnameseDateParser(), date_column)
+
+    # Lưu kết quả dạng cột (Parquet/CSV); upload dùng luôn DataFrame trong bộ nhớ
     try:
-        df.to_excel(r"C:\Users\Administrator\Desktop\Crawl\crawled_new.xlsx", index=False)
-        print("Processing completed. Results updated in 'crawled.xlsx'")
+        saved_path = save_table(df, output_path)
+        logging.info(f"Processing completed. Results saved to '{saved_path}'")
 
         # Show some sample data
-        print("\nSample of processed data:")
         sample = pd.DataFrame({
             'DATE_ORIGINAL': df['DATE'].head(),
             'DATE_CONVERTED': df['DATE CONVERTED'].head(),
@@ -132,49 +469,72 @@ def main():
             'COMMENT': df['COMMENT'].head(),
             'SHARE': df['SHARE'].head()
         })
-        print(sample)
+        logging.info(f"Sample of processed data:\n{sample}")
 
     except Exception as e:
-        print(f"Có lỗi khi lưu file: {str(e)}")
-        print("Vui lòng đảm bảo file Excel không đang được mở bởi chương trình khác.")
-
-    # Đọc Excel
-    df = pd.read_excel(r"C:\Users\Administrator\Desktop\Crawl\crawled_new.xlsx")
-    ## Cập nhật lên API
-    for index, row in df.iterrows():
-        if pd.isna(row.iloc[0]):  # Nếu ID bị NaN
-            print(f"⚠️ Bỏ qua dòng {index} vì thiếu ID")
-            continue
-        data = {
-            "id_bai_viet": int(row.iloc[0]),    # ID BÀI VIẾT
-            "id_nguoi_dung": row.iloc[2],       # TÁC GIẢ
-            "noi_dung_bai_viet": row.iloc[1],   # NỘI DUNG
-            "like": row.iloc[3],                # LIKE
-            "share": row.iloc[4],               # SHARE
-            "comment": row.iloc[5],             # COMMENT
-            "content": row.iloc[6],             # Tổng tương tác
-            "created": row.iloc[7],             # DATE
-            "created_time": row.iloc[9],        # DATE CONVERTED
-            "inserted_time": row.iloc[8],       # TGIAN CHUẨN
-            "modified_time": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),       # DATE CONVERTED
-            "is_deleted": row.iloc[10]          # ĐÃ XÓA
-        }
-        ## print(data)
+        logging.error(f"Có lỗi khi lưu file: {str(e)}")
+        logging.error("Vui lòng đảm bảo file không đang được mở bởi chương trình khác.")
+    return df
 
-        # Loại bỏ NaN
-        data = clean_nan_values(data)
 
+def main():
+    setup_logging(log_file=None)
+    logging.info("===== XỬ LÝ DỮ LIỆU BÀI VIẾT VÀ CẬP NHẬT API =====")
+
+    # Đường dẫn mặc định tương đối với thư mục đang chạy
+    input_path = os.getenv("PROCESS_INPUT", "crawled.xlsx")
+    # Cùng file kết quả và chỉ mục upload mặc định với lệnh upload
+    output_path = processed_path()
+    excel_path = os.getenv("PROCESS_EXCEL_OUTPUT", "crawled_new.xlsx")
+    export_excel = os.getenv("EXPORT_EXCEL", "false").lower() == "true"
+    delta_upload = os.getenv("DELTA_UPLOAD", "true").lower() == "true"
+    # > 0: đọc và xử lý file theo từng chunk, dùng cho file lớn
+    chunk_size = env_int("PROCESS_CHUNK_SIZE", 0)
+
+    if not os.path.exists(input_path):
+        logging.error(f"Không tìm thấy file {input_path}")
+        return
+    # Báo thiếu pyarrow trước khi xử lý, không phải sau khi đã tính xong cả file
+    try:
+        require_parquet_support(input_path)
+        if chunk_size <= 0:
+            require_parquet_support(output_path)
+    except ImportError as e:
+        logging.error(str(e))
+        return
+
+    ## Cập nhật lên API theo lô, chỉ gửi dòng mới hoặc đã thay đổi
+    upload_index = UploadIndex.from_env() if delta_upload else None
+    uploader = RowUploader.from_env(API_URL, upload_index=upload_index)
+    df = None
+    try:
+        if chunk_size > 0:
+            report = process_stream(input_path, output_path, chunk_size, uploader)['upload']
+        else:
+            df = process_file(input_path, output_path)
+            report = uploader.upload(build_payloads(df)) if df is not None else None
+    finally:
+        uploader.close()
+        if upload_index is not None:
+            upload_index.close()
+
+    if report is not None:
+        logging.info(f"⏭️ Bỏ qua {report['unchanged']} dòng không đổi")
+        logging.info(f"✅ Đã cập nhật {report['updated']}/{report['rows']} dòng")
+        if report['failed_rows']:
+            failed_ids = [row['id_bai_viet'] for row in report['failed_rows']]
+            logging.error(f"❌ {len(failed_ids)} dòng cập nhật lỗi, ID: {failed_ids[:50]}")
+
+    # Xuất Excel (tùy chọn) sau cùng, không chặn việc upload
+    if export_excel and df is None and chunk_size > 0:
+        logging.warning("Bỏ qua xuất Excel ở chế độ xử lý theo chunk.")
+    elif export_excel and df is not None:
         try:
-            headers = {"Content-Type": "application/json"}
-            response = requests.put(api_url, json=data, headers=headers, timeout=10)
-            response.raise_for_status()
-            if response.status_code == 200:
-                print(f"✅ Đã cập nhật ID {row.iloc[0]}")
-            else:
-                print(f"❌ Lỗi cập nhật ID {row.iloc[0]}: {response.status_code} - {response.text}")
+            df.to_excel(excel_path, index=False)
+            logging.info(f"Đã xuất Excel: {excel_path}")
         except Exception as e:
-            print(f"⚠️ Lỗi kết nối cho ID {row.iloc[0]}: {e}")
-
+            logging.error(f"Có lỗi khi xuất Excel: {str(e)}")
+            logging.error("Vui lòng đảm bảo file Excel không đang được mở bởi chương trình khác.")
 
 
 if __name__ == "__main__":
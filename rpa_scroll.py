@@ -0,0 +1,115 @@
+"""Cuộn trang theo tín hiệu nội dung mới thay vì ngủ cố định.
+
+Mỗi lần ``AdaptiveScroller.scroll`` cuộn một bước rồi chờ ngay trong trình
+duyệt (một lần ``execute_async_script``) cho tới khi:
+
+- ``content``: trang dài ra hoặc có thêm ``[role="article"]`` (Facebook đã tải thêm bài);
+- ``scrolled``: chưa tới gần cuối trang và DOM đã yên (không có mutation trong
+  ``quiet_ms``), tức là phần vừa cuộn qua đã có sẵn nội dung để lấy link;
+- ``timeout``: đã ở gần cuối trang nhưng không có gì mới sau ``max_wait`` giây;
+- ``stuck``: trang không cuộn được (``scrollY`` không đổi, ví dụ modal hay tường
+  đăng nhập khóa cuộn) và không có nội dung mới.
+
+Bước cuộn tự điều chỉnh theo độ trễ tải quan sát được: nội dung về nhanh thì
+cuộn xa hơn, hết thời gian chờ thì cuộn ngắn lại. ``min_delay`` là khoảng nghỉ
+tối thiểu giữa hai lần cuộn để không gửi request dồn dập lên Facebook.
+"""
+
+import time
+import random
+
+from rpa_env import env_float
+
+_SCROLL_AND_WAIT_JS = """
+const step = arguments[0], timeoutMs = arguments[1], quietMs = arguments[2];
+const done = arguments[arguments.length - 1];
+const start = performance.now();
+const articleCount = () => document.querySelectorAll('[role="article"]').length;
+const h0 = document.body.scrollHeight;
+const a0 = articleCount();
+const y0 = window.scrollY;
+window.scrollBy(0, step);
+const moved = () => window.scrollY !== y0;
+const nearBottom = () =>
+    document.body.scrollHeight - (window.scrollY + window.innerHeight) < 1.5 * window.innerHeight;
+
+let finished = false, quietTimer = null, observer = null, timer = null;
+const finish = (reason) => {
+    if (finished) return;
+    finished = true;
+    if (observer) observer.disconnect();
+    clearTimeout(timer);
+    clearTimeout(quietTimer);
+    done({
+        reason: reason,
+        elapsed: (performance.now() - start) / 1000,
+        height: document.body.scrollHeight,
+        articles: articleCount(),
+        y: window.scrollY,
+    });
+};
+const check = () => {
+    if (document.body.scrollHeight !== h0 || articleCount() > a0) {
+        finish('content');
+    } else if (!nearBottom()) {
+        clearTimeout(quietTimer);
+        quietTimer = setTimeout(() => finish(moved() ? 'scrolled' : 'stuck'), quietMs);
+    }
+};
+observer = new MutationObserver(check);
+observer.observe(document.body, {childList: true, subtree: true});
+timer = setTimeout(() => finish(nearBottom() ? 'timeout' : moved() ? 'scrolled' : 'stuck'), timeoutMs);
+check();
+"""
+
+
+class AdaptiveScroller:
+    """Cuộn trang và chờ nội dung mới với trần thời gian và khoảng nghỉ tối thiểu."""
+
+    def __init__(self, min_delay=0.8, max_wait=5.0, step=800, min_step=300, max_step=2400, quiet_ms=150):
+        self.min_delay = min_delay
+        self.max_wait = max_wait
+        self.step = step
+        self.min_step = min_step
+        self.max_step = max_step
+        self.quiet_ms = quiet_ms
+        self.avg_latency = None
+        self._timeout_driver = None
+
+    @classmethod
+    def from_env(cls):
+        """Tạo scroller từ biến môi trường SCROLL_MIN_DELAY, SCROLL_MAX_WAIT, SCROLL_STEP."""
+        return cls(
+            min_delay=env_float("SCROLL_MIN_DELAY", 0.8),
+            max_wait=env_float("SCROLL_MAX_WAIT", 5.0),
+            step=int(env_float("SCROLL_STEP", 800)),
+        )
+
+    def scroll(self, driver):
+        """Cuộn một bước và chờ tín hiệu; trả về dict {reason, elapsed, height, articles, y}."""
+        started = time.monotonic()
+        if self._timeout_driver is not driver:
+            driver.set_script_timeout(self.max_wait + 10)
+            self._timeout_driver = driver
+        result = driver.execute_async_script(
+            _SCROLL_AND_WAIT_JS, int(self.step), int(self.max_wait * 1000), self.quiet_ms
+        )
+        self._adapt(result)
+
+        # Khoảng nghỉ tối thiểu (có jitter) giữa hai lần cuộn
+        remaining = self.min_delay * random.uniform(1.0, 1.5) - (time.monotonic() - started)
+        if remaining > 0:
+            time.sleep(remaining)
+        return result
+
+    def _adapt(self, result):
+        reason = result["reason"]
+        if reason == "content":
+            latency = result["elapsed"]
+            self.avg_latency = latency if self.avg_latency is None else 0.7 * self.avg_latency + 0.3 * latency
+            if self.avg_latency < self.max_wait / 4:
+                self.step = min(self.max_step, self.step * 1.5)
+        elif reason == "scrolled":
+            self.step = min(self.max_step, self.step * 1.25)
+        else:
+            self.step = max(self.min_step, self.step / 2)
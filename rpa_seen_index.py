@@ -0,0 +1,65 @@
+"""Chỉ mục link bài viết đã gửi lên API, lưu trên đĩa giữa các lần chạy.
+
+Khóa là URL đã qua ``clean_post_url``. Toàn bộ chỉ mục được nạp vào bộ nhớ
+khi khởi động để tra cứu nhanh trong vòng lặp cuộn; link chỉ được ghi xuống
+SQLite sau khi API xác nhận đã nhận, nên link gửi lỗi sẽ được gửi lại ở lần sau.
+"""
+
+import os
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+
+DEFAULT_PATH = "seen_posts.sqlite3"
+
+
+class SeenIndex:
+    """Tập link đã gửi thành công, đồng bộ với một file SQLite."""
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen_posts (url TEXT PRIMARY KEY, submitted_at TEXT NOT NULL)"
+        )
+        self._conn.commit()
+        self._urls = {row[0] for row in self._conn.execute("SELECT url FROM seen_posts")}
+        logging.info(f"Đã nạp {len(self._urls)} link đã gửi từ {path}")
+
+    @classmethod
+    def from_env(cls):
+        """Tạo chỉ mục từ biến môi trường SEEN_INDEX_PATH."""
+        return cls(os.getenv("SEEN_INDEX_PATH", DEFAULT_PATH))
+
+    def __contains__(self, url):
+        return url in self._urls
+
+    def __len__(self):
+        return len(self._urls)
+
+    def recent(self, limit=None):
+        """Các link đã gửi, mới nhất trước (tối đa limit link nếu có)."""
+        sql = "SELECT url FROM seen_posts ORDER BY submitted_at DESC"
+        params = ()
+        if limit:
+            sql += " LIMIT ?"
+            params = (limit,)
+        with self._lock:
+            return [row[0] for row in self._conn.execute(sql, params)]
+
+    def add_many(self, urls):
+        """Ghi nhận các link đã được API xác nhận."""
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO seen_posts (url, submitted_at) VALUES (?, ?)",
+                [(url, now) for url in urls],
+            )
+            self._conn.commit()
+            self._urls.update(urls)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
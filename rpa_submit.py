@@ -0,0 +1,218 @@
+"""Gửi link bài viết lên api_bai_viet.php theo lô, chạy nền.
+
+Vòng lặp cuộn trang của crawler chỉ gọi ``LinkSubmitter.add`` để đưa link vào
+một hàng đợi có giới hạn; một luồng nền gom link thành lô (đủ ``batch_size``
+hoặc quá ``flush_interval`` giây) và giao cho thread pool gửi song song qua
+``rpa_api_client.ApiClient`` (dùng chung connection pool, có timeout, thử lại
+với backoff và ngắt mạch). ``close`` chờ gửi hết hàng đợi rồi mới trả về.
+
+Chế độ ``bulk`` gửi một request duy nhất cho cả lô::
+
+    {"urls": ["https://www.facebook.com/groups/.../posts/...", ...]}
+
+Server được coi là hỗ trợ gửi theo lô khi trả về HTTP 2xx kèm JSON có khóa
+``results`` (mỗi phần tử ứng với một link theo thứ tự; phần tử có ``"ok": false``
+hoặc khóa ``error`` là link bị từ chối, link không có phần tử tương ứng cũng
+tính là lỗi). Chỉ link được chấp nhận mới được ghi vào chỉ mục. Khi server trả
+về 2xx không có ``results`` hoặc mã lỗi cho thấy endpoint không nhận lô
+(``_BULK_UNSUPPORTED_STATUS``), lô đó được gửi lại từng link một với payload cũ
+``{"url": ...}`` và các lô sau cũng dùng chế độ từng link. Lỗi tạm thời (429,
+5xx, lỗi kết nối) chỉ làm hỏng lô hiện tại, không đổi chế độ.
+
+Nếu có ``seen_index`` (``rpa_seen_index.SeenIndex``), link gửi thành công được
+ghi vào chỉ mục để các lần chạy sau bỏ qua.
+"""
+
+import os
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from rpa_api_client import ApiClient
+from rpa_env import env_float, env_int
+from rpa_metrics import metrics
+
+API_URL = "https://api.rpa4edu.shop/api_bai_viet.php"
+
+_STOP = object()
+
+# Mã HTTP cho thấy endpoint không nhận gửi theo lô (server cũ chỉ nhận {"url": ...}),
+# khác với bị giới hạn tốc độ (429) hay lỗi tạm thời
+_BULK_UNSUPPORTED_STATUS = (400, 404, 405, 415, 422, 501)
+
+
+class LinkSubmitter:
+    """Hàng đợi link bài viết, gửi lên API theo lô bằng luồng nền."""
+
+    def __init__(
+        self,
+        api_url=API_URL,
+        batch_size=20,
+        flush_interval=10.0,
+        bulk=True,
+        workers=4,
+        queue_size=1000,
+        client=None,
+        seen_index=None,
+    ):
+        self.api_url = api_url
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.bulk = bulk
+        workers = max(1, workers)
+        self.client = client or ApiClient(pool_size=workers)
+        self.seen_index = seen_index
+
+        self.sent = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+        self._closed = False
+        self._queued = set()
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="submit")
+        self._dispatcher = threading.Thread(target=self._dispatch, name="submit-dispatcher", daemon=True)
+        self._dispatcher.start()
+
+    @classmethod
+    def from_env(cls, seen_index=None, bulk=None):
+        """Tạo submitter từ các biến môi trường SUBMIT_* (bulk=None: theo SUBMIT_MODE)."""
+        workers = max(1, env_int("SUBMIT_WORKERS", 4))
+        if bulk is None:
+            bulk = os.getenv("SUBMIT_MODE", "bulk").lower() != "single"
+        return cls(
+            batch_size=env_int("SUBMIT_BATCH_SIZE", 20),
+            flush_interval=env_float("SUBMIT_FLUSH_SECONDS", 10.0),
+            bulk=bulk,
+            workers=workers,
+            queue_size=env_int("SUBMIT_QUEUE_SIZE", 1000),
+            client=ApiClient.from_env(pool_size=workers),
+            seen_index=seen_index,
+        )
+
+    def already_sent(self, url):
+        """True nếu link đã được API xác nhận ở lần chạy này hoặc lần chạy trước."""
+        return self.seen_index is not None and url in self.seen_index
+
+    def add(self, url):
+        """Đưa một link vào hàng đợi; chỉ chặn khi hàng đợi đầy.
+
+        Trả về False nếu link đã được đưa vào trước đó trong lần chạy này
+        (ví dụ cùng một bài viết xuất hiện ở hai group).
+        """
+        with self._lock:
+            if url in self._queued:
+                return False
+            self._queued.add(url)
+        self._queue.put(url)
+        return True
+
+    def close(self):
+        """Gửi hết link còn trong hàng đợi, dừng các luồng nền và ghi log thống kê."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._dispatcher.join()
+        self._pool.shutdown(wait=True)
+        self.client.close()
+        logging.info(f"Đã gửi {self.sent} link lên API, {self.failed} link lỗi.")
+
+    def _dispatch(self):
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                break
+            if item is not None:
+                batch.append(item)
+
+            if len(batch) >= self.batch_size or (batch and time.monotonic() >= deadline):
+                self._pool.submit(self._send_batch, batch)
+                batch = []
+            if time.monotonic() >= deadline:
+                deadline = time.monotonic() + self.flush_interval
+
+        if batch:
+            self._pool.submit(self._send_batch, batch)
+
+    def _send_batch(self, batch):
+        if self.bulk:
+            with metrics.timer("submit_batch", mode="bulk"):
+                failed = self._post_bulk(batch)
+            if failed is not False:
+                rejected = set(failed)
+                self._record([url for url in batch if url not in rejected], len(failed))
+                return
+
+        with metrics.timer("submit_batch", mode="single"):
+            sent = [url for url in batch if self._post_single(url)]
+        self._record(sent, len(batch) - len(sent))
+
+    def _record(self, sent_urls, failed):
+        if sent_urls and self.seen_index is not None:
+            self.seen_index.add_many(sent_urls)
+        with self._lock:
+            self.sent += len(sent_urls)
+            self.failed += failed
+        metrics.inc("links_submitted", len(sent_urls))
+        if failed:
+            metrics.inc("links_failed", failed)
+
+    def _post_bulk(self, batch):
+        """Gửi cả lô. Trả về các link lỗi, hoặc False nếu server không hỗ trợ gửi theo lô."""
+        try:
+            resp = self.client.post(self.api_url, json={"urls": batch})
+        except requests.exceptions.RequestException as e:
+            logging.error(f"Lỗi kết nối khi gửi lô {len(batch)} link: {e}")
+            return batch
+
+        try:
+            result = resp.json()
+        except ValueError:
+            result = None
+        results = result.get("results") if isinstance(result, dict) else None
+
+        if resp.status_code in _BULK_UNSUPPORTED_STATUS or (resp.ok and not isinstance(results, list)):
+            logging.warning(
+                f"API không nhận gửi theo lô (HTTP {resp.status_code}), chuyển sang gửi từng link."
+            )
+            self.bulk = False
+            return False
+        if not resp.ok or not isinstance(results, list):
+            logging.error(f"API lỗi khi gửi lô {len(batch)} link: HTTP {resp.status_code}")
+            return batch
+
+        failed = [
+            url for url, item in zip(batch, results)
+            if isinstance(item, dict) and (item.get("ok") is False or "error" in item)
+        ]
+        # Link không có kết quả tương ứng (server dừng giữa lô) chưa chắc đã được nhận
+        failed.extend(batch[len(results):])
+        if failed:
+            logging.warning(f"API từ chối {len(failed)}/{len(batch)} link trong lô: {result.get('message', '')}")
+        else:
+            logging.info(f"Đã gửi lô {len(batch)} link lên API: {result.get('message', '')}")
+        return failed
+
+    def _post_single(self, url):
+        try:
+            resp = self.client.post(self.api_url, json={"url": url})
+        except requests.exceptions.RequestException as e:
+            logging.error(f"Lỗi kết nối khi gửi API cho link {url}: {e}")
+            return False
+
+        if resp.status_code == 200:
+            logging.debug(f"Đã gửi link lên API: {url}")
+            return True
+        logging.warning(f"API lỗi với {url}: {resp.status_code} - {resp.text}")
+        return False
@@ -0,0 +1,279 @@
+"""Cập nhật dữ liệu bài viết đã xử lý lên api_bai_viet.php theo lô, song song.
+
+``RowUploader.upload`` chia danh sách payload (dict có ``id_bai_viet`` hoặc
+``url``) thành các lô ``batch_size`` dòng và gửi tối đa ``workers`` lô cùng
+lúc qua ``rpa_api_client.ApiClient``. Chế độ ``bulk`` gửi một PUT cho cả lô::
+
+    {"rows": [{"id_bai_viet": 123, "like": 10, ...}, ...]}
+
+Server được coi là hỗ trợ cập nhật theo lô khi trả về HTTP 2xx kèm JSON có
+khóa ``results`` (mỗi phần tử ứng với một dòng theo thứ tự; phần tử có
+``"ok": false`` hoặc khóa ``error`` là dòng lỗi; dòng không có phần tử
+tương ứng khi ``results`` ngắn hơn lô cũng là dòng lỗi). Nếu không, lô đó và
+các lô sau được gửi từng dòng với payload cũ như trước đây.
+
+Payload thường nhận diện dòng bằng ``id_bai_viet`` (ID dòng của API). Với
+``key="url"`` (chi tiết bài viết từ ``rpa_detail``), dòng được nhận diện bằng
+``url`` và body gửi kèm ``"key": "url"`` để API tra theo link bài viết.
+
+Kết quả từng lô được ghi log; các dòng lỗi được gom lại và gửi lại thêm
+``retries`` lượt trước khi trả về báo cáo.
+
+Nếu có ``upload_index`` (``rpa_upload_index.UploadIndex``), chỉ các dòng mới
+hoặc có nội dung thay đổi so với lần cập nhật thành công trước mới được gửi,
+và mỗi lô thành công được ghi vào chỉ mục ngay khi API xác nhận.
+
+``read_payloads_csv`` đọc lại file CSV đã xử lý để upload mà không cần pandas
+(lệnh ``python -m rpacrawl upload``).
+"""
+
+import os
+import csv
+import math
+import time
+import logging
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+
+from rpa_api_client import ApiClient
+from rpa_env import env_int
+
+API_URL = "http://api.rpa4edu.shop/api_bai_viet.php"
+
+# Khóa nhận diện dòng mặc định: ID dòng của API
+DEFAULT_KEY = "id_bai_viet"
+
+# File kết quả mặc định của lệnh process, cũng là file đầu vào mặc định của lệnh upload
+DEFAULT_PROCESSED_PATH = "crawled_new.csv"
+
+# Khóa trong payload API -> vị trí cột trong file crawled và kiểu giá trị
+# ("int": số nguyên, có thể trống; "text": chuỗi; "time": thời gian dạng chuỗi)
+PAYLOAD_COLUMNS = [
+    ("id_bai_viet", 0, "int"),          # ID BÀI VIẾT
+    ("id_nguoi_dung", 2, "text"),       # TÁC GIẢ
+    ("noi_dung_bai_viet", 1, "text"),   # NỘI DUNG
+    ("like", 3, "int"),                 # LIKE
+    ("share", 4, "int"),                # SHARE
+    ("comment", 5, "int"),              # COMMENT
+    ("content", 6, "text"),             # Tổng tương tác
+    ("created", 7, "text"),             # DATE
+    ("created_time", 9, "time"),        # DATE CONVERTED
+    ("inserted_time", 8, "text"),       # TGIAN CHUẨN
+    ("is_deleted", 10, "int"),          # ĐÃ XÓA
+]
+
+
+class RowUploader:
+    """Gửi payload cập nhật bài viết theo lô với số luồng song song giới hạn."""
+
+    def __init__(
+        self, api_url, batch_size=100, workers=4, bulk=True, retries=1, client=None, upload_index=None, key=DEFAULT_KEY
+    ):
+        self.api_url = api_url
+        self.key = key
+        self.batch_size = max(1, batch_size)
+        self.workers = max(1, workers)
+        self.bulk = bulk
+        self.retries = max(0, retries)
+        self.client = client or ApiClient(pool_size=self.workers)
+        self.upload_index = upload_index
+
+    @classmethod
+    def from_env(cls, api_url, upload_index=None, key=DEFAULT_KEY):
+        """Tạo uploader từ các biến môi trường UPLOAD_*."""
+        workers = max(1, env_int("UPLOAD_WORKERS", 4))
+        return cls(
+            api_url,
+            batch_size=env_int("UPLOAD_BATCH_SIZE", 100),
+            workers=workers,
+            bulk=os.getenv("UPLOAD_MODE", "bulk").lower() != "single",
+            retries=env_int("UPLOAD_RETRIES", 1),
+            client=ApiClient.from_env(pool_size=workers),
+            upload_index=upload_index,
+            key=key,
+        )
+
+    def upload(self, rows):
+        """Gửi toàn bộ rows, thử lại các dòng lỗi; trả về dict báo cáo.
+
+        Báo cáo gồm rows, unchanged, updated, failed, batches, seconds,
+        rows_per_sec và failed_rows (payload các dòng vẫn lỗi sau mọi lượt thử lại).
+        """
+        rows = list(rows)
+        started = time.monotonic()
+        total = len(rows)
+        if self.upload_index is not None:
+            rows = self.upload_index.changed(rows)
+            logging.info(f"{total - len(rows)}/{total} dòng không đổi so với lần cập nhật trước, bỏ qua.")
+        pending = rows
+        batches = 0
+        for attempt in range(self.retries + 1):
+            if not pending:
+                break
+            if attempt:
+                logging.info(f"Thử lại {len(pending)} dòng lỗi (lượt {attempt}/{self.retries})...")
+            pending, sent_batches = self._upload_once(pending)
+            batches += sent_batches
+
+        elapsed = time.monotonic() - started
+        report = {
+            "rows": len(rows),
+            "unchanged": total - len(rows),
+            "updated": len(rows) - len(pending),
+            "failed": len(pending),
+            "batches": batches,
+            "seconds": round(elapsed, 2),
+            "rows_per_sec": round(len(rows) / elapsed, 1) if elapsed > 0 else 0.0,
+            "failed_rows": pending,
+        }
+        logging.info(
+            f"Đã cập nhật {report['updated']}/{report['rows']} dòng trong {report['seconds']}s "
+            f"({report['rows_per_sec']} dòng/s), {report['failed']} dòng lỗi."
+        )
+        return report
+
+    def close(self):
+        self.client.close()
+
+    def _upload_once(self, rows):
+        batches = [rows[i:i + self.batch_size] for i in range(0, len(rows), self.batch_size)]
+        failed = []
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="upload") as pool:
+            futures = {pool.submit(self._send_batch, batch): n for n, batch in enumerate(batches, 1)}
+            for future in as_completed(futures):
+                n = futures[future]
+                batch_failed = future.result()
+                failed.extend(batch_failed)
+                batch = batches[n - 1]
+                size = len(batch)
+                if self.upload_index is not None and len(batch_failed) < size:
+                    failed_ids = {id(row) for row in batch_failed}
+                    self.upload_index.add_many([row for row in batch if id(row) not in failed_ids])
+                if batch_failed:
+                    logging.warning(f"Lô {n}/{len(batches)}: {size - len(batch_failed)}/{size} dòng thành công.")
+                else:
+                    logging.info(f"Lô {n}/{len(batches)}: {size}/{size} dòng thành công.")
+        return failed, len(batches)
+
+    def _send_batch(self, batch):
+        """Gửi một lô, trả về danh sách dòng lỗi."""
+        if self.bulk:
+            failed = self._put_bulk(batch)
+            if failed is not False:
+                return failed
+        return [row for row in batch if not self._put_single(row)]
+
+    def _put_bulk(self, batch):
+        """Gửi cả lô. Trả về các dòng lỗi, hoặc False nếu server không hỗ trợ."""
+        try:
+            resp = self.client.put(self.api_url, json=self._body({"rows": batch}))
+        except requests.exceptions.RequestException as e:
+            logging.error(f"Lỗi kết nối khi cập nhật lô {len(batch)} dòng: {e}")
+            return batch
+        if resp.status_code >= 500:
+            logging.error(f"API lỗi khi cập nhật lô {len(batch)} dòng: HTTP {resp.status_code}")
+            return batch
+
+        try:
+            result = resp.json()
+        except ValueError:
+            result = None
+
+        if resp.ok and isinstance(result, dict) and isinstance(result.get("results"), list):
+            results = result["results"]
+            failed = [
+                row for row, item in zip(batch, results)
+                if isinstance(item, dict) and (item.get("ok") is False or "error" in item)
+            ]
+            if len(results) < len(batch):
+                # Dòng không có kết quả tương ứng (server dừng giữa lô) chưa chắc đã được cập nhật
+                logging.warning(f"API chỉ trả về {len(results)}/{len(batch)} kết quả, coi các dòng còn lại là lỗi.")
+                failed.extend(batch[len(results):])
+            return failed
+
+        logging.warning(
+            f"API không nhận cập nhật theo lô (HTTP {resp.status_code}), chuyển sang gửi từng dòng."
+        )
+        self.bulk = False
+        return False
+
+    def _body(self, payload):
+        # Khóa khác mặc định được ghi rõ để API không tìm dòng theo id_bai_viet
+        return payload if self.key == DEFAULT_KEY else dict(payload, key=self.key)
+
+    def _put_single(self, row):
+        row_id = row.get(self.key)
+        try:
+            resp = self.client.put(self.api_url, json=self._body(row))
+        except requests.exceptions.RequestException as e:
+            logging.error(f"Lỗi kết nối cho ID {row_id}: {e}")
+            return False
+
+        if resp.status_code == 200:
+            logging.debug(f"Đã cập nhật ID {row_id}")
+            return True
+        logging.warning(f"Lỗi cập nhật ID {row_id}: {resp.status_code} - {resp.text}")
+        return False
+
+
+def processed_path():
+    """File kết quả đã xử lý: PROCESS_OUTPUT hoặc DEFAULT_PROCESSED_PATH (dùng chung cho process và upload)."""
+    return os.getenv("PROCESS_OUTPUT", DEFAULT_PROCESSED_PATH)
+
+
+def _csv_value(text, kind):
+    # Cùng giá trị như build_payloads của rpa_process_data (cột có kiểu cố định
+    # theo PAYLOAD_COLUMNS), để hash trong UploadIndex không đổi giữa upload sau
+    # xử lý và upload lại từ file
+    if kind != "int" or text == "":
+        return text
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        number = float(text)  # file cũ ghi số nguyên dạng "2.0"
+    except ValueError:
+        return ""
+    if number.is_integer():
+        return int(number)
+    return number if math.isfinite(number) else ""
+
+
+def read_payloads_csv(path, modified_time=None, key=DEFAULT_KEY):
+    """Đọc payload cập nhật API từ file CSV đã xử lý (cùng cột như build_payloads của rpa_process_data).
+
+    key="url": file từ bước lấy chi tiết, dòng được nhận diện bằng cột URL;
+    ID bài viết Facebook ở cột đầu được giữ nguyên dạng chuỗi trong post_id.
+    """
+    if modified_time is None:
+        modified_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    payloads = []
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return payloads
+        # File từ bước lấy chi tiết (rpa_detail) có thêm cột URL bài viết
+        url_pos = header.index("URL") if "URL" in header else None
+        if key == "url" and url_pos is None:
+            raise ValueError(f"File {path} không có cột URL để nhận diện dòng theo url")
+
+        for index, row in enumerate(reader):
+            record = {
+                name: _csv_value(row[pos], kind) if pos < len(row) else "" for name, pos, kind in PAYLOAD_COLUMNS
+            }
+            if url_pos is not None:
+                record["url"] = row[url_pos] if url_pos < len(row) else ""
+            if key == "url":
+                del record["id_bai_viet"]
+                record["post_id"] = row[0] if row else ""
+            if record[key] == "":
+                logging.warning(f"⚠️ Bỏ qua dòng {index} vì thiếu {'ID' if key == DEFAULT_KEY else key}")
+                continue
+            record["modified_time"] = modified_time
+            payloads.append(record)
+    return payloads
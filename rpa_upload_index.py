@@ -0,0 +1,88 @@
+"""Chỉ mục nội dung bài viết đã cập nhật lên API, lưu trên đĩa giữa các lần chạy.
+
+Mỗi ``id_bai_viet`` được lưu kèm hash của payload lần cập nhật thành công gần
+nhất (không tính ``modified_time`` và ``created_time``). Trước khi upload, các
+dòng có hash trùng với lần trước bị bỏ qua, nên chỉ bài viết mới hoặc có
+LIKE/SHARE/COMMENT... thay đổi mới được gửi lại. Hash chỉ được ghi sau khi API
+xác nhận, nên dòng gửi lỗi sẽ được gửi lại ở lần sau.
+
+Dòng từ bước lấy chi tiết (``rpa_detail``) được nhận diện bằng ``url`` thay vì
+``id_bai_viet`` (``key="url"``) và lưu ở bảng riêng, không lẫn với ID dòng của API.
+
+``created_time`` của ngày tương đối ("5 giờ", "hôm qua") được tính từ thời điểm
+xử lý nên đổi ở mọi lần chạy; hash dùng ngày gốc ``created`` thay cho nó.
+"""
+
+import os
+import json
+import logging
+import sqlite3
+import hashlib
+import threading
+from datetime import datetime
+
+DEFAULT_PATH = "uploaded_rows.sqlite3"
+
+# Trường thay đổi ở mọi lần chạy, không phản ánh nội dung bài viết
+_VOLATILE_FIELDS = ("modified_time", "created_time")
+
+# Khóa nhận diện dòng -> (bảng, kiểu cột khóa) trong SQLite
+_KEY_TABLES = {
+    "id_bai_viet": ("uploaded_rows", "INTEGER"),
+    "url": ("uploaded_rows_by_url", "TEXT"),
+}
+
+
+def row_hash(row):
+    """Hash ổn định của payload, bỏ qua các trường thời gian cập nhật."""
+    content = {k: v for k, v in row.items() if k not in _VOLATILE_FIELDS}
+    text = json.dumps(content, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class UploadIndex:
+    """Hash payload đã cập nhật thành công theo khóa dòng (id_bai_viet hoặc url), đồng bộ với SQLite."""
+
+    def __init__(self, path=DEFAULT_PATH, key="id_bai_viet"):
+        if key not in _KEY_TABLES:
+            raise ValueError(f"Khóa dòng không hợp lệ: {key} (hỗ trợ: {', '.join(_KEY_TABLES)})")
+        self.path = path
+        self.key = key
+        self._table, key_type = _KEY_TABLES[key]
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self._table} ("
+            f"{key} {key_type} PRIMARY KEY, row_hash TEXT NOT NULL, uploaded_at TEXT NOT NULL)"
+        )
+        self._conn.commit()
+        self._hashes = dict(self._conn.execute(f"SELECT {key}, row_hash FROM {self._table}"))
+        logging.info(f"Đã nạp {len(self._hashes)} bài viết đã cập nhật từ {path} (theo {key})")
+
+    @classmethod
+    def from_env(cls, key="id_bai_viet"):
+        """Tạo chỉ mục từ biến môi trường UPLOAD_INDEX_PATH (mặc định DEFAULT_PATH trong thư mục đang chạy)."""
+        return cls(os.getenv("UPLOAD_INDEX_PATH", DEFAULT_PATH), key=key)
+
+    def __len__(self):
+        return len(self._hashes)
+
+    def changed(self, rows):
+        """Lọc ra các dòng mới hoặc có nội dung khác lần cập nhật trước."""
+        return [row for row in rows if self._hashes.get(row[self.key]) != row_hash(row)]
+
+    def add_many(self, rows):
+        """Ghi nhận các dòng đã được API xác nhận."""
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        hashes = {row[self.key]: row_hash(row) for row in rows}
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO {self._table} ({self.key}, row_hash, uploaded_at) VALUES (?, ?, ?)",
+                [(row_id, h, now) for row_id, h in hashes.items()],
+            )
+            self._conn.commit()
+            self._hashes.update(hashes)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,44 @@
+"""Crawler lấy link bài viết từ group Facebook và gửi lên api_bai_viet.php.
+
+- ``rpacrawl.cookies``: đọc, ghi và kiểm tra file cookie;
+- ``rpacrawl.session``: mở Chrome, đăng nhập bằng cookie (hoặc email/mật khẩu);
+- ``rpacrawl.strategies``: các cách tìm link bài viết trong trang (chọn theo tên);
+- ``rpacrawl.crawler``: vòng lặp cuộn trang, lấy link và đưa vào ``LinkSubmitter``;
+- ``rpacrawl.cli``: dòng lệnh ``python -m rpacrawl <lệnh>``.
+
+Các module dùng chung khác (``rpa_scroll``, ``rpa_dom``, ``rpa_submit``,
+``rpa_http_crawl``...) vẫn nằm ở thư mục gốc.
+
+Các tên dưới đây chỉ được import khi dùng tới (PEP 562), nên ``import rpacrawl``
+hay ``python -m rpacrawl cookies`` không kéo theo selenium.
+"""
+
+import importlib
+
+_EXPORTS = {
+    "check_cookies": "rpacrawl.cookies",
+    "parse_cookie_file": "rpacrawl.cookies",
+    "save_cookies": "rpacrawl.cookies",
+    "is_session_alive": "rpacrawl.session",
+    "login_to_facebook": "rpacrawl.session",
+    "open_session": "rpacrawl.session",
+    "retry_on_failure": "rpacrawl.session",
+    "setup_driver": "rpacrawl.session",
+    "STRATEGIES": "rpacrawl.strategies",
+    "DiscoveryStrategy": "rpacrawl.strategies",
+    "get_strategy": "rpacrawl.strategies",
+    "get_post_links_from_group": "rpacrawl.crawler",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module), name)
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
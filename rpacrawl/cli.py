@@ -0,0 +1,348 @@
+"""Dòng lệnh của crawler: ``python -m rpacrawl <lệnh> [tùy chọn]``.
+
+- ``crawl``: lấy link bài viết từ các group và gửi lên API;
+- ``detail``: lấy chi tiết bài viết đã thu thập (``rpa_detail``);
+- ``process``: xử lý file crawled và cập nhật API (``rpa_process_data``);
+- ``upload``: chỉ cập nhật API từ file CSV đã xử lý, không cần pandas;
+- ``cookies``: kiểm tra file cookie (thiếu hoặc sắp hết hạn) mà không mở trình duyệt.
+
+Module này chỉ import thư viện chuẩn; selenium, pandas, requests được import
+trong từng lệnh cần tới, nên ``--help`` hay ``cookies`` khởi động gần như tức thì
+(đo bằng ``python -m benchmarks.bench_startup``).
+
+Tùy chọn của ``crawl`` có giá trị mặc định lấy từ biến môi trường như trước
+(MAX_POSTS, EXTRACT_MODE, CRAWL_BACKEND, SUBMIT_MODE, LEAN_BROWSING...); tùy
+chọn trên dòng lệnh được ưu tiên hơn biến môi trường::
+
+    python -m rpacrawl crawl --strategy containers --submit-mode single --profile full
+    python -m rpacrawl crawl --backend http --max-posts 300 --group https://www.facebook.com/groups/abc
+    python -m rpacrawl cookies --warn-days 7
+"""
+
+import os
+import sys
+import time
+import getpass
+import logging
+import argparse
+from datetime import datetime
+
+from rpa_env import env_float, env_int
+from rpa_logging import setup_logging
+
+STRATEGY_NAMES = ("observer", "js", "anchors", "containers")
+
+DEFAULT_GROUP_URL = "https://www.facebook.com/groups/tansinhvienneu"
+
+
+def _env_choice(name, default):
+    return os.getenv(name, default).lower()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="rpacrawl", description="Lấy link bài viết Facebook và gửi lên API.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    crawl = subparsers.add_parser("crawl", help="lấy link bài viết từ các group và gửi lên API")
+    crawl.add_argument(
+        "--backend",
+        choices=["selenium", "http"],
+        default=_env_choice("CRAWL_BACKEND", "selenium"),
+        help="selenium: Chrome đầy đủ; http: tải trang mbasic bằng HTTP thuần (CRAWL_BACKEND)",
+    )
+    crawl.add_argument(
+        "--strategy",
+        default=_env_choice("EXTRACT_MODE", "observer"),
+        help=f"cách tìm link khi dùng selenium: {', '.join(STRATEGY_NAMES)} (EXTRACT_MODE)",
+    )
+    crawl.add_argument(
+        "--submit-mode",
+        choices=["bulk", "single"],
+        default=_env_choice("SUBMIT_MODE", "bulk"),
+        help="gửi link lên API theo lô hay từng link (SUBMIT_MODE)",
+    )
+    crawl.add_argument(
+        "--profile",
+        choices=["lean", "full"],
+        default="lean" if _env_choice("LEAN_BROWSING", "false") == "true" else "full",
+        help="lean: Chrome không tải ảnh, video, font (LEAN_BROWSING)",
+    )
+    crawl.add_argument(
+        "--group",
+        action="append",
+        dest="groups",
+        metavar="URL",
+        help="group cần crawl (lặp lại được; mặc định GROUP_URLS/GROUPS_FILE)",
+    )
+    crawl.add_argument(
+        "--max-posts",
+        type=int,
+        default=env_int("MAX_POSTS", 50),
+        help="số link tối đa mỗi group (MAX_POSTS)",
+    )
+    crawl.add_argument(
+        "--stop-after-seen",
+        type=int,
+        default=env_int("STOP_AFTER_SEEN", 20),
+        help="dừng group sau chừng này bài đã gửi liên tiếp, 0 để tắt (STOP_AFTER_SEEN)",
+    )
+    crawl.add_argument(
+        "--concurrency",
+        type=int,
+        default=env_int("CRAWL_CONCURRENCY", 1),
+        help="số trình duyệt song song (CRAWL_CONCURRENCY)",
+    )
+    crawl.add_argument(
+        "--cycles",
+        type=int,
+        default=env_int("CRAWL_CYCLES", 1),
+        help="số lượt crawl toàn bộ danh sách group (CRAWL_CYCLES)",
+    )
+    crawl.add_argument(
+        "--interval",
+        type=float,
+        default=env_float("CRAWL_INTERVAL", 600),
+        help="số giây nghỉ giữa các lượt (CRAWL_INTERVAL)",
+    )
+    crawl.add_argument(
+        "--prune-dom",
+        action=argparse.BooleanOptionalAction,
+        default=os.getenv("PRUNE_DOM") == "true",
+        help="làm rỗng bài viết đã xử lý khỏi DOM (PRUNE_DOM)",
+    )
+    crawl.add_argument("--cookies", default="facebook_cookies.txt", help="file cookie Facebook")
+    crawl.add_argument(
+        "--ask-login",
+        action="store_true",
+        help="hỏi email/mật khẩu để đăng nhập nếu cookie hết hạn (hoặc đặt FB_EMAIL/FB_PASSWORD)",
+    )
+    crawl.set_defaults(func=cmd_crawl)
+
+    detail = subparsers.add_parser(
+        "detail", help="lấy chi tiết các bài viết đã thu thập (biến DETAIL_*; upload chỉ khi DETAIL_UPLOAD=true)"
+    )
+    detail.set_defaults(func=cmd_detail)
+
+    process = subparsers.add_parser("process", help="xử lý file crawled và cập nhật API (biến PROCESS_*)")
+    process.set_defaults(func=cmd_process)
+
+    upload = subparsers.add_parser("upload", help="cập nhật API từ file đã xử lý, không xử lý lại")
+    upload.add_argument(
+        "--input",
+        help=(
+            "file kết quả của lệnh process (.csv; .xlsx cần pandas, .parquet cần thêm pyarrow), "
+            "mặc định giống lệnh process: PROCESS_OUTPUT hoặc rpa_upload.DEFAULT_PROCESSED_PATH"
+        ),
+    )
+    upload.add_argument(
+        "--no-delta",
+        dest="delta",
+        action="store_false",
+        default=os.getenv("DELTA_UPLOAD", "true").lower() == "true",
+        help="gửi lại mọi dòng, không bỏ qua dòng không đổi (DELTA_UPLOAD)",
+    )
+    upload.add_argument(
+        "--key",
+        choices=["id_bai_viet", "url"],
+        default="id_bai_viet",
+        help=(
+            "khóa nhận diện dòng: id_bai_viet (file của lệnh process) hoặc url (file của lệnh detail; "
+            "chỉ dùng khi API đã hỗ trợ nhận diện dòng theo url)"
+        ),
+    )
+    upload.add_argument("--api-url", help="endpoint cập nhật bài viết (mặc định api_bai_viet.php)")
+    upload.set_defaults(func=cmd_upload)
+
+    cookies = subparsers.add_parser("cookies", help="kiểm tra file cookie mà không mở trình duyệt")
+    cookies.add_argument("--cookies", default="facebook_cookies.txt", help="file cookie Facebook")
+    cookies.add_argument(
+        "--warn-days",
+        type=int,
+        default=3,
+        help="cảnh báo nếu cookie hết hạn trong chừng này ngày",
+    )
+    cookies.set_defaults(func=cmd_cookies)
+    return parser
+
+
+def _credentials(args):
+    email, password = os.getenv("FB_EMAIL"), os.getenv("FB_PASSWORD")
+    if args.ask_login and not (email and password):
+        email = input("Nhập email Facebook: ")
+        password = getpass.getpass("Nhập password Facebook: ")
+    return (email, password) if email and password else None
+
+
+def cmd_crawl(args):
+    from rpa_checkpoint import CrawlCheckpoint
+    from rpa_jobs import DriverPool, crawl_groups, load_group_urls
+    from rpa_metrics import metrics
+    from rpa_seen_index import SeenIndex
+    from rpa_submit import LinkSubmitter
+
+    setup_logging()
+    logging.info("===== TOOL LẤY LINK BÀI VIẾT FACEBOOK =====")
+
+    group_urls = args.groups or load_group_urls(default=DEFAULT_GROUP_URL)
+    cycles = max(1, args.cycles)
+    if args.backend == "selenium":
+        # Chỉ backend selenium mới cần tới selenium
+        from rpa_browser import LeanProfile
+        from rpacrawl.crawler import get_post_links_from_group
+        from rpacrawl.session import is_session_alive, open_session
+        from rpacrawl.strategies import get_strategy
+
+        try:
+            strategy = get_strategy(args.strategy)
+        except ValueError as e:
+            logging.error(str(e))
+            return 2
+    else:
+        from rpa_http_crawl import crawl_group_http, open_http_session
+        from rpacrawl.cookies import parse_cookie_file
+
+    # Chỉ mục link đã gửi ở các lần chạy trước
+    seen_index = SeenIndex.from_env()
+    submitter = LinkSubmitter.from_env(seen_index, bulk=args.submit_mode == "bulk")
+
+    # Tiến độ từng group được lưu định kỳ; RESUME=false để bỏ qua checkpoint cũ
+    checkpoint = CrawlCheckpoint.from_env()
+
+    if args.backend == "http":
+        logging.info("Dùng backend HTTP (mbasic.facebook.com), không mở Chrome.")
+        cookies = parse_cookie_file(args.cookies)
+
+        def crawl(session, group_url):
+            return crawl_group_http(
+                session, group_url, args.max_posts, submitter, args.stop_after_seen, checkpoint=checkpoint
+            )
+
+        pool = DriverPool(lambda slot: open_http_session(cookies))
+    else:
+        logging.info(f"Dùng Chrome ({args.profile}), tìm link bằng chiến lược {strategy.name}.")
+        lean = LeanProfile.from_env(enabled=args.profile == "lean") or False
+        credentials = _credentials(args)
+
+        def crawl(driver, group_url):
+            return get_post_links_from_group(
+                driver,
+                group_url,
+                args.max_posts,
+                submitter,
+                args.stop_after_seen,
+                strategy,
+                prune_dom=args.prune_dom,
+                checkpoint=checkpoint,
+            )
+
+        # Trình duyệt đã đăng nhập được giữ lại giữa các group và các lượt crawl
+        pool = DriverPool(lambda slot: open_session(args.cookies, slot, lean, credentials), is_alive=is_session_alive)
+
+    try:
+        for cycle in range(1, cycles + 1):
+            if cycle > 1:
+                logging.info(f"Chờ {args.interval}s trước lượt crawl thứ {cycle}/{cycles}")
+                time.sleep(args.interval)
+            results = crawl_groups(group_urls, pool, crawl, args.concurrency)
+            if any(r["links"] for r in results):
+                logging.info(f"✅ Đã gửi {sum(r['links'] for r in results)} bài viết mới lên API!")
+            else:
+                logging.warning("⚠️ Không thu thập được bài viết nào.")
+    except Exception as e:
+        logging.error(f"Lỗi chính: {e}")
+    finally:
+        pool.close()
+        submitter.close()
+        checkpoint.flush()
+        seen_index.close()
+        metrics.export_from_env("crawl_metrics.json")
+    return 0
+
+
+def cmd_detail(args):
+    import rpa_detail
+    from rpa_metrics import metrics
+
+    try:
+        rpa_detail.main()
+    finally:
+        metrics.export_from_env("detail_metrics.json")
+    return 0
+
+
+def cmd_process(args):
+    import rpa_process_data
+
+    rpa_process_data.main()
+    return 0
+
+
+def cmd_upload(args):
+    from rpa_upload import API_URL, RowUploader, processed_path, read_payloads_csv
+    from rpa_upload_index import UploadIndex
+
+    setup_logging(log_file=None)
+    # Cùng file mặc định với lệnh process (rpa_upload.processed_path)
+    input_path = args.input or processed_path()
+    if not os.path.exists(input_path):
+        logging.error(f"Không tìm thấy file {input_path}")
+        return 1
+
+    try:
+        if input_path.lower().endswith(".csv"):
+            payloads = read_payloads_csv(input_path, key=args.key)
+        else:
+            from rpa_process_data import build_payloads, load_table
+
+            payloads = build_payloads(load_table(input_path), key=args.key)
+    except (ImportError, ValueError) as e:
+        logging.error(str(e))
+        return 1
+    logging.info(f"Đọc được {len(payloads)} dòng từ {input_path}")
+
+    # Cùng chỉ mục với lệnh process (UPLOAD_INDEX_PATH hoặc rpa_upload_index.DEFAULT_PATH)
+    upload_index = UploadIndex.from_env(key=args.key) if args.delta else None
+    uploader = RowUploader.from_env(args.api_url or API_URL, upload_index=upload_index, key=args.key)
+    try:
+        report = uploader.upload(payloads)
+    finally:
+        uploader.close()
+        if upload_index is not None:
+            upload_index.close()
+    if report["failed_rows"]:
+        failed_ids = [row[args.key] for row in report["failed_rows"]]
+        logging.error(f"❌ {len(failed_ids)} dòng cập nhật lỗi, ID: {failed_ids[:50]}")
+        return 1
+    return 0
+
+
+def cmd_cookies(args):
+    from rpacrawl.cookies import check_cookies, parse_cookie_file
+
+    setup_logging(log_file=None)
+    if not os.path.exists(args.cookies):
+        logging.error(f"Không tìm thấy file cookie: {args.cookies}")
+        return 1
+
+    report = check_cookies(parse_cookie_file(args.cookies), warn_days=args.warn_days)
+    logging.info(f"Đọc được {report['count']} cookie từ {args.cookies}")
+    if report["missing"]:
+        logging.error(f"Thiếu cookie đăng nhập: {', '.join(report['missing'])}")
+    if report["expired"]:
+        logging.error(f"Cookie đã hết hạn: {', '.join(report['expired'])}")
+    if report["expiring"]:
+        logging.warning(f"Cookie sắp hết hạn (trong {args.warn_days} ngày): {', '.join(report['expiring'])}")
+    if report["expires_at"]:
+        logging.info(f"Cookie đăng nhập hết hạn lúc {datetime.fromtimestamp(report['expires_at']):%Y-%m-%d %H:%M}")
+    if report["ok"]:
+        logging.info("✅ Cookie hợp lệ.")
+    return 0 if report["ok"] else 1
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
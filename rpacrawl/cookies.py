@@ -0,0 +1,91 @@
+"""Đọc, ghi và kiểm tra file cookie Facebook, chỉ dùng thư viện chuẩn.
+
+File cookie có dạng Netscape (mỗi dòng 7 trường phân tách bằng tab: domain,
+flag, path, secure, expiry, name, value) hoặc ``name=value``. Tách khỏi
+``rpacrawl.session`` để backend HTTP và lệnh ``python -m rpacrawl cookies``
+không phải import selenium.
+"""
+
+import re
+import time
+import logging
+
+# Cookie bắt buộc để phiên đăng nhập Facebook còn hiệu lực
+REQUIRED_COOKIES = ("c_user", "xs")
+
+
+def parse_cookie_file(cookie_file_path):
+    cookies_list = []
+    try:
+        with open(cookie_file_path, "r", encoding="utf-8") as file:
+            for line in file:
+                if not line.strip() or line.startswith("#"):
+                    continue
+                try:
+                    parts = line.strip().split("\t")
+                    if len(parts) >= 7:
+                        domain, flag, path, secure, expiration, name, value = parts[:7]
+                        cookie = {
+                            "name": name,
+                            "value": value,
+                            "domain": domain,
+                            "path": path,
+                            "secure": secure.lower() == "true" or secure == "1",
+                            "expiry": int(expiration) if expiration != "0" else None,
+                        }
+                        cookies_list.append(cookie)
+                    else:
+                        match = re.search(r"(\w+)=([^;]+)", line)
+                        if match:
+                            cookies_list.append(
+                                {
+                                    "name": match.group(1),
+                                    "value": match.group(2),
+                                    "domain": ".facebook.com",
+                                }
+                            )
+                except Exception as e:
+                    logging.warning(f"Lỗi phân tích dòng cookie: {line} - {e}")
+    except Exception as e:
+        logging.error(f"Lỗi đọc file cookie: {e}")
+    return cookies_list
+
+
+def save_cookies(driver, cookie_file_path):
+    """Lưu cookie hiện tại của trình duyệt ra file theo định dạng parse_cookie_file đọc được."""
+    try:
+        with open(cookie_file_path, "w", encoding="utf-8") as f:
+            for cookie in driver.get_cookies():
+                f.write(
+                    f"{cookie['domain']}\tTRUE\t{cookie['path']}\t"
+                    f"{cookie['secure']}\t{cookie.get('expiry', 0)}\t"
+                    f"{cookie['name']}\t{cookie['value']}\n"
+                )
+        logging.info(f"Đã lưu cookies vào {cookie_file_path}")
+    except Exception as e:
+        logging.error(f"Lỗi khi lưu cookies: {e}")
+
+
+def check_cookies(cookies, now=None, warn_days=3):
+    """Kiểm tra cookie đăng nhập mà không mở trình duyệt; trả về dict báo cáo.
+
+    Báo cáo gồm count, missing (cookie bắt buộc không có), expired, expiring
+    (hết hạn trong warn_days ngày tới), expires_at (hạn sớm nhất của các cookie
+    bắt buộc, epoch giây hoặc None) và ok.
+    """
+    now = time.time() if now is None else now
+    by_name = {cookie["name"]: cookie for cookie in cookies}
+    missing = [name for name in REQUIRED_COOKIES if name not in by_name]
+    expiries = {
+        name: by_name[name].get("expiry") for name in REQUIRED_COOKIES if by_name.get(name, {}).get("expiry")
+    }
+    expired = [name for name, expiry in expiries.items() if expiry <= now]
+    expiring = [name for name, expiry in expiries.items() if now < expiry <= now + warn_days * 86400]
+    return {
+        "count": len(cookies),
+        "missing": missing,
+        "expired": expired,
+        "expiring": expiring,
+        "expires_at": min(expiries.values()) if expiries else None,
+        "ok": not missing and not expired,
+    }
@@ -0,0 +1,163 @@
+"""Lấy link bài viết từ trang group Facebook bằng trình duyệt đã đăng nhập.
+
+Vòng lặp: cuộn trang (``rpa_scroll.AdaptiveScroller``), lấy link bằng chiến lược
+đã chọn (``rpacrawl.strategies``), đưa link mới vào ``LinkSubmitter`` để gửi
+nền lên API. Dừng khi đủ ``max_posts``, khi trang không tải thêm nội dung hoặc
+khi gặp liên tiếp ``stop_after_seen`` bài đã gửi ở các lần chạy trước.
+"""
+
+import time
+import logging
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+
+from rpa_dom import prune_harvested_posts
+from rpa_logging import ProgressLog
+from rpa_metrics import metrics
+from rpa_scroll import AdaptiveScroller
+from rpa_submit import LinkSubmitter
+
+from rpacrawl.session import retry_on_failure
+from rpacrawl.strategies import get_strategy
+
+# Dừng group sau chừng này lần cuộn liên tiếp không có link mới vì trang không
+# tải thêm ("timeout") hoặc không cuộn được ("stuck")
+MAX_NO_PROGRESS = 5
+# Trần số lần cuộn liên tiếp không có link mới với bất kỳ lý do nào (không tính
+# lúc đang cuộn nhanh tới vị trí của checkpoint)
+MAX_IDLE_SCROLLS = 30
+
+
+@retry_on_failure(max_attempts=3, delay=5)
+def get_post_links_from_group(
+    driver,
+    group_url,
+    max_posts=50,
+    submitter=None,
+    stop_after_seen=0,
+    strategy="observer",
+    scroller=None,
+    prune_dom=False,
+    checkpoint=None,
+):
+    """Lấy link bài viết từ group và đưa vào submitter; trả về số link mới thu thập được.
+
+    strategy: tên chiến lược trong rpacrawl.strategies.STRATEGIES hoặc một DiscoveryStrategy.
+    Nếu stop_after_seen > 0, dừng cuộn khi gặp liên tiếp stop_after_seen bài viết
+    đã gửi ở các lần chạy trước. Nếu prune_dom=True, các bài viết đã lấy link và
+    đã cuộn qua được làm rỗng để giữ bộ nhớ Chrome ổn định.
+    """
+    strategy = get_strategy(strategy)
+    own_submitter = submitter is None
+    if own_submitter:
+        submitter = LinkSubmitter.from_env()
+    if scroller is None:
+        scroller = AdaptiveScroller.from_env()
+    try:
+        return _collect_post_links(
+            driver, group_url, max_posts, submitter, stop_after_seen, strategy, scroller, prune_dom, checkpoint
+        )
+    finally:
+        if own_submitter:
+            submitter.close()
+
+
+def _collect_post_links(
+    driver, group_url, max_posts, submitter, stop_after_seen, strategy, scroller, prune_dom, checkpoint=None
+):
+    try:
+        with metrics.timer("page_load", backend="selenium"):
+            driver.get(group_url)
+            WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+    except TimeoutException:
+        logging.error("Không tải được trang nhóm Facebook.")
+        return 0
+
+    strategy.prepare(driver)
+
+    # Tiếp tục lần crawl bị ngắt: link đã thu thập được bỏ qua (không tính vào
+    # chuỗi bài đã gửi), cuộn bước dài tới gần vị trí cũ rồi mới cuộn bình thường
+    collected_links, state = checkpoint.restore(group_url, submitter) if checkpoint else (set(), None)
+    resume_y = (state or {}).get("scroll_y") or 0
+    seen_links = set()  # link đã gửi ở các lần chạy trước
+    seen_streak = 0
+    no_new_count = 0
+    idle_scrolls = 0
+    scroll_y = 0
+    progress = ProgressLog(f"Group {group_url}", total=max_posts)
+
+    while len(collected_links) < max_posts and no_new_count < MAX_NO_PROGRESS:
+        if idle_scrolls >= MAX_IDLE_SCROLLS:
+            logging.warning(f"Cuộn {idle_scrolls} lần liên tiếp không có link mới, dừng group.")
+            break
+        if scroll_y < resume_y:
+            scroller.step = scroller.max_step
+        # Cuộn và chờ tới khi facebook tải thêm nội dung (tối đa scroller.max_wait giây)
+        started = time.monotonic()
+        scroll_result = scroller.scroll(driver)
+        scroll_y = scroll_result.get("y", 0)
+        metrics.observe("scroll", time.monotonic() - started, reason=scroll_result["reason"])
+
+        # Lấy link bài viết trong trang sau cuộn
+        with metrics.timer("extract", mode=strategy.name):
+            links = strategy.extract(driver)
+
+        new_found = False
+        for href_clean in links:
+            if href_clean in collected_links or href_clean in seen_links:
+                continue
+            if submitter.already_sent(href_clean):
+                seen_links.add(href_clean)
+                seen_streak += 1
+                if stop_after_seen and seen_streak >= stop_after_seen:
+                    break
+                continue
+            seen_streak = 0
+            if not submitter.add(href_clean):
+                # Đã được group khác đưa vào hàng đợi trong lần chạy này
+                seen_links.add(href_clean)
+                continue
+            collected_links.add(href_clean)
+            metrics.inc("links_collected")
+            progress.tick(href_clean)
+
+            new_found = True
+            if len(collected_links) >= max_posts:
+                break
+
+        # Làm rỗng các bài viết đã lấy link và đã cuộn qua để giữ bộ nhớ Chrome ổn định
+        if prune_dom:
+            pruned = prune_harvested_posts(driver, links)
+            if pruned:
+                logging.debug(f"Đã làm rỗng {pruned} bài viết đã xử lý khỏi DOM")
+
+        if checkpoint:
+            checkpoint.update(group_url, collected_links, submitter, scroll_y=max(scroll_y, resume_y))
+
+        if stop_after_seen and seen_streak >= stop_after_seen:
+            logging.info(f"Gặp {seen_streak} bài viết đã gửi liên tiếp, dừng cuộn (chế độ incremental).")
+            break
+
+        if new_found:
+            no_new_count = idle_scrolls = 0
+        elif scroll_result["reason"] in ("timeout", "stuck"):
+            no_new_count += 1
+            idle_scrolls += 1
+            logging.info(
+                f"Không tìm được link mới lần thứ {no_new_count}, "
+                f"trang không tải thêm nội dung ({scroll_result['reason']})"
+            )
+        else:
+            no_new_count = 0
+            if scroll_y >= resume_y:
+                idle_scrolls += 1
+
+    if checkpoint:
+        checkpoint.mark_done(group_url)
+    progress.done()
+    if len(collected_links) == 0:
+        logging.warning("Không thu thập được link bài viết nào.")
+    return len(collected_links)
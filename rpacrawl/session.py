@@ -0,0 +1,200 @@
+"""Mở Chrome, đăng nhập Facebook bằng cookie và giữ phiên đăng nhập cho crawler.
+
+Dùng chung cho mọi lệnh cần trình duyệt đã đăng nhập (``rpacrawl.crawler``,
+``rpa_detail``). Cookie được đọc bằng ``rpacrawl.cookies``; nếu cookie hết hạn
+và có email/mật khẩu, đăng nhập bằng form rồi lưu lại cookie mới vào file.
+"""
+
+import os
+import time
+import logging
+import tempfile
+from functools import wraps
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+from rpa_browser import LeanProfile
+from rpa_metrics import metrics
+
+from rpacrawl.cookies import parse_cookie_file, save_cookies
+
+_SEARCH_BOX_XPATH = "//input[@placeholder='Tìm kiếm trên Facebook' or @placeholder='Search Facebook']"
+
+
+def retry_on_failure(max_attempts=3, delay=2):
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            for attempt in range(1, max_attempts + 1):
+                try:
+                    return func(*args, **kwargs)
+                except Exception as e:
+                    if attempt == max_attempts:
+                        logging.error(f"[{func.__name__}] Thất bại sau {max_attempts} lần thử: {e}")
+                        raise
+                    logging.warning(f"[{func.__name__}] Thử lần {attempt} thất bại: {e}. Đợi {delay}s rồi thử lại...")
+                    time.sleep(delay)
+
+        return wrapper
+
+    return decorator
+
+
+def setup_driver(profile_dir=None, lean=None):
+    """Mở Chrome với các tùy chọn của crawler.
+
+    lean: LeanProfile để chặn ảnh/video/font, False để tắt, None để theo LEAN_BROWSING.
+    """
+    chrome_options = Options()
+    chrome_options.add_argument("--disable-notifications")
+    chrome_options.add_argument("--start-maximized")
+    chrome_options.add_argument("--disable-infobars")
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--disable-popup-blocking")
+
+    # LEAN_BROWSING=true: không tải ảnh, video, font (tiết kiệm băng thông trên CI)
+    if lean is None:
+        lean = LeanProfile.from_env()
+    if lean:
+        lean.apply_options(chrome_options)
+
+    # Profile cố định giữ cookie/cache giữa các lần chạy; mặc định dùng profile tạm
+    # để tránh lỗi "user-data-dir"
+    if profile_dir:
+        os.makedirs(profile_dir, exist_ok=True)
+    else:
+        profile_dir = tempfile.mkdtemp()
+    chrome_options.add_argument(f"--user-data-dir={profile_dir}")
+
+    # Tùy chọn dành cho chạy CI/CD, headless Chrome mới và tăng ổn định
+    if os.getenv("CI") == "true":
+        chrome_options.add_argument("--headless=new")  # Chrome mới dùng --headless=new
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")  # Giảm lỗi bộ nhớ chia sẻ
+        # Cổng 0 để mỗi trình duyệt tự chọn cổng trống khi chạy nhiều trình duyệt song song
+        chrome_options.add_argument("--remote-debugging-port=0")
+
+    service = Service()
+    driver = webdriver.Chrome(service=service, options=chrome_options)
+    if lean:
+        lean.apply_driver(driver)
+    return driver
+
+
+def is_session_alive(driver):
+    """Kiểm tra nhanh phiên đăng nhập qua cookie c_user.
+
+    Chỉ tải facebook.com nếu trình duyệt chưa ở domain này (ví dụ vừa mở);
+    trình duyệt vừa crawl xong một group thì không cần tải lại trang nào.
+    """
+    try:
+        if "facebook.com" not in driver.current_url:
+            driver.get("https://www.facebook.com")
+        return driver.get_cookie("c_user") is not None
+    except Exception:
+        return False
+
+
+@retry_on_failure(max_attempts=3, delay=5)
+def login_to_facebook(driver, cookie_file_path, credentials=None):
+    """Đăng nhập bằng file cookie; nếu thất bại và có credentials (email, mật khẩu) thì đăng nhập bằng form."""
+    if _login_with_cookies(driver, cookie_file_path):
+        return True
+    if not credentials:
+        return False
+    logging.warning("Cookie không hợp lệ, thử đăng nhập bằng email/mật khẩu...")
+    if manual_login(driver, *credentials):
+        save_cookies(driver, cookie_file_path)
+        return True
+    logging.error("Đăng nhập bằng email/mật khẩu thất bại.")
+    return False
+
+
+def _login_with_cookies(driver, cookie_file_path):
+    # Profile cố định có thể vẫn còn phiên đăng nhập từ lần chạy trước
+    if is_session_alive(driver):
+        logging.info("Phiên đăng nhập còn hiệu lực, bỏ qua bước nạp cookie.")
+        return True
+
+    if not os.path.exists(cookie_file_path):
+        logging.error(f"Không tìm thấy file cookie: {cookie_file_path}")
+        return False
+
+    cookies_list = parse_cookie_file(cookie_file_path)
+    if not cookies_list:
+        logging.error("Không có cookie hợp lệ trong file.")
+        return False
+
+    # is_session_alive đã mở facebook.com, có thể thêm cookie ngay
+    driver.delete_all_cookies()
+
+    added = 0
+    for cookie in cookies_list:
+        try:
+            driver.add_cookie(cookie)
+            added += 1
+        except Exception as e:
+            logging.warning(f"Không thể thêm cookie {cookie.get('name')}: {e}")
+
+    logging.info(f"Đã thêm {added}/{len(cookies_list)} cookie vào trình duyệt")
+
+    driver.get("https://www.facebook.com")
+    try:
+        wait = WebDriverWait(driver, 10)
+        wait.until(
+            EC.presence_of_element_located((By.XPATH, _SEARCH_BOX_XPATH))
+        )
+        logging.info("Đăng nhập thành công!")
+        return True
+    except Exception:
+        logging.error("Không thể xác minh đăng nhập. Có thể cookie đã hết hạn.")
+        return False
+
+
+def manual_login(driver, email, password):
+    """Đăng nhập bằng form email/mật khẩu của facebook.com."""
+    try:
+        driver.get("https://www.facebook.com")
+        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "email"))).send_keys(email)
+        driver.find_element(By.ID, "pass").send_keys(password)
+        driver.find_element(By.NAME, "login").click()
+        WebDriverWait(driver, 15).until(EC.presence_of_element_located((By.XPATH, _SEARCH_BOX_XPATH)))
+        logging.info("Đăng nhập thủ công thành công!")
+        return True
+    except Exception as e:
+        logging.error(f"Lỗi khi đăng nhập thủ công: {e}")
+        return False
+
+
+def open_session(cookie_file_path, slot=0, lean=None, credentials=None):
+    """Mở một trình duyệt và đăng nhập; trả về driver hoặc None nếu thất bại.
+
+    Nếu có CHROME_PROFILE_DIR, trình duyệt thứ slot dùng profile cố định
+    <CHROME_PROFILE_DIR>/worker-<slot> để giữ phiên đăng nhập giữa các lần chạy.
+    """
+    profile_root = os.getenv("CHROME_PROFILE_DIR")
+    profile_dir = os.path.join(profile_root, f"worker-{slot}") if profile_root else None
+
+    driver = None
+    try:
+        with metrics.timer("driver_startup"):
+            driver = setup_driver(profile_dir, lean)
+        with metrics.timer("login"):
+            logged_in = login_to_facebook(driver, cookie_file_path, credentials)
+        if logged_in:
+            return driver
+        logging.error("Đăng nhập Facebook thất bại, không thể thu thập bài viết.")
+    except Exception as e:
+        logging.error(f"Lỗi khi mở trình duyệt: {e}")
+    if driver:
+        try:
+            driver.quit()
+        except Exception as e:
+            logging.error(f"Lỗi khi đóng trình duyệt: {e}")
+    return None
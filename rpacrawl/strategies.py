@@ -0,0 +1,95 @@
+"""Các cách tìm link bài viết trong trang group đang mở, chọn theo tên.
+
+Mỗi chiến lược gồm ``prepare(driver)`` (gọi một lần sau khi tải trang group)
+và ``extract(driver)`` (gọi sau mỗi lần cuộn, trả về danh sách link đã bỏ query
+string). Crawler tự loại link trùng nên ``extract`` có thể trả lại link cũ.
+
+- ``observer`` (mặc định): MutationObserver trong trang gom link mới, mỗi vòng
+  chỉ một lần ``execute_script`` trả về phần chênh lệch;
+- ``js``: quét cả trang bằng một lần ``execute_script``;
+- ``anchors``: duyệt từng thẻ ``<a>`` qua WebDriver (mỗi thẻ một round-trip);
+- ``containers``: tìm từng khung bài viết ``role="article"`` rồi lấy link đầu
+  tiên trong đó qua WebDriver (cách cũ của ``rpa_crawl.py``/``rpa_fb_crawl.py``).
+
+So sánh tốc độ các chiến lược bằng ``python -m benchmarks.bench_crawl``.
+"""
+
+import logging
+
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+
+from rpa_dom import drain_post_links, extract_post_links, install_link_observer
+
+_CONTAINER_LINK_XPATH = (
+    ".//a[contains(@href, '/groups/') and contains(@href, '/posts/')"
+    " and not(ancestor::div[contains(@class, 'text_exposed_root')])]"
+)
+
+
+class DiscoveryStrategy:
+    """Một cách lấy link bài viết: prepare chạy sau khi tải trang, extract sau mỗi lần cuộn."""
+
+    def __init__(self, name, extract, prepare=None):
+        self.name = name
+        self.extract = extract
+        self._prepare = prepare
+
+    def prepare(self, driver):
+        if self._prepare:
+            self._prepare(driver)
+
+    def __repr__(self):
+        return f"DiscoveryStrategy({self.name!r})"
+
+
+def extract_anchor_links(driver):
+    """Duyệt từng thẻ <a> qua WebDriver (chậm, mỗi thẻ một round-trip; giữ lại để so sánh)."""
+    links = []
+    for a in driver.find_elements(By.TAG_NAME, "a"):
+        try:
+            href = a.get_attribute("href")
+        except StaleElementReferenceException:
+            continue
+        if href and "/groups/" in href and "/posts/" in href:
+            links.append(href.split("?")[0])
+    return links
+
+
+def extract_container_links(driver):
+    """Lấy link đầu tiên của mỗi khung bài viết (role="article" hoặc FeedUnit) qua WebDriver."""
+    containers = driver.find_elements(By.XPATH, "//div[@role='article']")
+    if not containers:
+        containers = driver.find_elements(By.XPATH, "//div[contains(@data-pagelet, 'FeedUnit')]")
+    logging.debug(f"Tìm thấy {len(containers)} post containers trên màn hình.")
+
+    links = []
+    for container in containers:
+        try:
+            href = container.find_element(By.XPATH, _CONTAINER_LINK_XPATH).get_attribute("href")
+        except (NoSuchElementException, StaleElementReferenceException):
+            continue
+        if href:
+            links.append(href.split("?")[0])
+    return links
+
+
+STRATEGIES = {
+    "observer": DiscoveryStrategy("observer", drain_post_links, prepare=install_link_observer),
+    "js": DiscoveryStrategy("js", extract_post_links),
+    "anchors": DiscoveryStrategy("anchors", extract_anchor_links),
+    "containers": DiscoveryStrategy("containers", extract_container_links),
+}
+
+# Tên cũ của EXTRACT_MODE
+_ALIASES = {"webdriver": "anchors"}
+
+
+def get_strategy(name):
+    """Trả về DiscoveryStrategy theo tên (hoặc chính đối tượng nếu đã là DiscoveryStrategy)."""
+    if isinstance(name, DiscoveryStrategy):
+        return name
+    key = _ALIASES.get(name.lower(), name.lower())
+    if key not in STRATEGIES:
+        raise ValueError(f"Chiến lược tìm link không hợp lệ: {name} (chọn một trong {', '.join(STRATEGIES)})")
+    return STRATEGIES[key]
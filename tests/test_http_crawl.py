@@ -0,0 +1,100 @@
+"""GroupPageParser / parse_group_page trên các trang mbasic đã lưu (tests/fixtures/mbasic)."""
+
+import os
+
+import pytest
+
+from rpa_http_crawl import crawl_group_http, parse_group_page
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "mbasic")
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def test_group_page_post_ids_and_next_page():
+    page = parse_group_page(load_fixture("group_page.html"))
+    # permalink, story.php?story_fbid= và link tuyệt đối /posts/; link bình luận trùng bài bị bỏ
+    assert page.post_ids == ["2412345678901234", "2412345678905678", "2412345678909999"]
+    assert page.next_href == "/groups/tansinhvienneu?bacr=1713580000%3A2412345678909999%3A%3A7&multi_permalinks&refid=18"
+    assert not page.login_required
+
+
+def test_last_page_has_no_next_page():
+    page = parse_group_page(load_fixture("group_last_page.html"))
+    assert page.post_ids == ["2412345670000001", "2412345670000002"]
+    assert page.next_href is None
+    assert not page.login_required
+
+
+def test_login_form_is_detected():
+    page = parse_group_page(load_fixture("login.html"))
+    assert page.login_required
+    assert page.post_ids == []
+    assert page.next_href is None
+
+
+def test_empty_group_page():
+    page = parse_group_page(load_fixture("empty.html"))
+    assert page.post_ids == []
+    assert page.next_href is None
+    assert not page.login_required
+
+
+class FixtureSession:
+    """Thay cho HttpSession: trả về fixture theo URL và ghi lại các URL đã tải."""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.urls = []
+
+    def get(self, url):
+        self.urls.append(url)
+        for marker, name in self.pages:
+            if marker in url:
+                return load_fixture(name)
+        raise AssertionError(f"URL không mong đợi: {url}")
+
+
+class RecordingSubmitter:
+    def __init__(self, sent=()):
+        self.sent = set(sent)
+        self.links = []
+
+    def already_sent(self, link):
+        return link in self.sent
+
+    def add(self, link):
+        self.links.append(link)
+        return True
+
+
+@pytest.fixture(autouse=True)
+def mbasic_base(monkeypatch):
+    monkeypatch.setenv("MBASIC_BASE", "https://mbasic.facebook.com")
+
+
+def test_crawl_follows_next_page_and_normalizes_links():
+    session = FixtureSession([("bacr=", "group_last_page.html"), ("/groups/tansinhvienneu", "group_page.html")])
+    submitter = RecordingSubmitter()
+    posts = crawl_group_http(session, "https://www.facebook.com/groups/tansinhvienneu", 50, submitter, page_delay=0)
+
+    assert posts == 5
+    assert session.urls == [
+        "https://mbasic.facebook.com/groups/tansinhvienneu",
+        "https://mbasic.facebook.com/groups/tansinhvienneu?bacr=1713580000%3A2412345678909999%3A%3A7"
+        "&multi_permalinks&refid=18",
+    ]
+    assert submitter.links[0] == "https://www.facebook.com/groups/tansinhvienneu/posts/2412345678901234/"
+    assert submitter.links[-1] == "https://www.facebook.com/groups/tansinhvienneu/posts/2412345670000002/"
+
+
+def test_crawl_stops_on_login_page():
+    session = FixtureSession([("/groups/", "login.html")])
+    submitter = RecordingSubmitter()
+    posts = crawl_group_http(session, "https://www.facebook.com/groups/tansinhvienneu", 50, submitter, page_delay=0)
+    assert posts == 0
+    assert submitter.links == []
+    assert len(session.urls) == 1
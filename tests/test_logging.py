@@ -0,0 +1,35 @@
+import logging
+
+import pytest
+
+import rpa_logging
+
+
+@pytest.fixture
+def root_logger(monkeypatch):
+    monkeypatch.delenv("LOG_FILE", raising=False)
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield root
+    rpa_logging.stop_logging()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    for handler in handlers:
+        root.addHandler(handler)
+    root.setLevel(level)
+
+
+@pytest.mark.parametrize("value, expected", [("debug", logging.DEBUG), ("WARNING", logging.WARNING)])
+def test_setup_logging_uses_log_level(monkeypatch, root_logger, value, expected):
+    monkeypatch.setenv("LOG_LEVEL", value)
+    rpa_logging.setup_logging(log_file=None)
+    assert root_logger.level == expected
+
+
+def test_setup_logging_falls_back_to_info_on_invalid_level(monkeypatch, capsys, root_logger):
+    monkeypatch.setenv("LOG_LEVEL", "VERBOSE")
+    rpa_logging.setup_logging(log_file=None)
+    rpa_logging.stop_logging()
+
+    assert root_logger.level == logging.INFO
+    assert "LOG_LEVEL=VERBOSE không hợp lệ, dùng INFO." in capsys.readouterr().err
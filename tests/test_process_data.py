@@ -0,0 +1,164 @@
+"""extract_metrics (vector hóa) phải cho cùng kết quả với process_data (từng dòng)."""
+
+import os
+import math
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from rpa_process_data import extract_metrics, process_data
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TEXTS = [
+    "Tất cả cảm xúc: 12 5 bình luận 3 lượt chia sẻ",
+    "Tất cả cảm xúc:1,2K 40 bình luận 1,1K lượt chia sẻ",
+    "Tất cả cảm xúc: 3 N",
+    "Tất cả cảm xúc: 7",
+    "2 bình luận",
+    "9 lượt chia sẻ",
+    "12 bình luận 4 bình luận",
+    "Thích",
+    "Bình luận",
+    "Sao chép",
+    "Chia sẻ",
+    "Thích Bình luận Chia sẻ",
+    "",
+    "Tất cả cảm xúc:\n25\n1 bình luận",
+    float("nan"),
+    None,
+]
+
+
+def _rowwise(values):
+    # Pipeline cũ áp dụng process_data(str(text)) cho từng dòng, NaN thành "nan"
+    return [process_data(str(v)) for v in values]
+
+
+def _vectorized(values):
+    metrics = extract_metrics(pd.Series(values, dtype=object))
+    return [
+        tuple(None if math.isnan(row[col]) else int(row[col]) for col in ("LIKE", "COMMENT", "SHARE"))
+        for _, row in metrics.iterrows()
+    ]
+
+
+@pytest.mark.parametrize("text", TEXTS, ids=repr)
+def test_extract_metrics_matches_process_data(text):
+    assert _vectorized([text]) == _rowwise([text])
+
+
+def test_extract_metrics_keeps_index():
+    texts = pd.Series(["Tất cả cảm xúc: 4", "Thích"], index=[10, 20])
+    metrics = extract_metrics(texts)
+    assert list(metrics.index) == [10, 20]
+    assert metrics.loc[10, "LIKE"] == 4
+    assert metrics.loc[20].isna().all()
+
+
+def test_extract_metrics_on_edge_cases():
+    likes, comments, shares = _vectorized(["Tất cả cảm xúc:1,2K 40 bình luận 1,1K lượt chia sẻ"])[0]
+    # "1,1K lượt chia sẻ": chữ K chen giữa số và "lượt" nên không lấy được số lượt chia sẻ
+    assert (likes, comments, shares) == (1, 40, None)
+    assert _vectorized(["Tất cả cảm xúc: 3 N"]) == [(3, None, None)]
+    assert _vectorized(["Thích"]) == [(None, None, None)]
+    assert _vectorized([float("nan")]) == [(None, None, None)]
+
+
+@pytest.mark.skipif(not os.path.exists(os.path.join(REPO_DIR, "crawled.xlsx")), reason="không có crawled.xlsx")
+def test_extract_metrics_matches_process_data_on_crawled_file():
+    df = pd.read_excel(os.path.join(REPO_DIR, "crawled.xlsx"))
+    texts = df.iloc[:, 6].tolist()
+    assert _vectorized(texts) == _rowwise(texts)
+
+
+def _crawled_frame():
+    columns = [
+        "ID", "NỘI DUNG", "TÁC GIẢ", "LIKE", "SHARE", "COMMENT", "Tổng tương tác", "DATE",
+        "TGIAN CHUẨN", "DATE CONVERTED", "ĐÃ XÓA", "ĐÃ THU THẬP ĐƯỢC", "TYPE",
+    ]
+    rows = [
+        [1001, "a", "x", None, None, None, "Tất cả cảm xúc: 5", "5 giờ", "2025-04-20 02:24:47", None, 0, 1, 2],
+        [1002, "b", "y", None, None, None, "Thích", "18 tháng 4 lúc 09:24", "2025-04-20 02:24:47", None, 0, 1, None],
+        [1003, "c", "z", None, None, None, "3 bình luận", "hôm qua", "2025-04-20 02:24:47", None, 0, 1, 1],
+    ]
+    return pd.DataFrame(rows, columns=columns)
+
+
+def test_transform_output_does_not_depend_on_chunking():
+    from rpa_process_data import VietnameseDateParser, transform
+
+    parser = VietnameseDateParser(datetime(2025, 4, 20, 12))
+    whole = transform(_crawled_frame(), parser).to_csv(index=False)
+    chunks = [transform(_crawled_frame().iloc[i:i + 1], parser) for i in range(3)]
+    chunked = "".join(chunk.to_csv(index=False, header=i == 0) for i, chunk in enumerate(chunks))
+    assert chunked == whole
+    assert ",2\n" in whole and "2.0" not in whole
+
+
+def test_build_payloads_by_url_keeps_facebook_post_id_exact():
+    from rpa_process_data import build_payloads
+
+    df = pd.DataFrame({
+        "ID": ["10161234567890123", None],
+        **{f"c{i}": [None, None] for i in range(1, 13)},
+        "URL": ["https://www.facebook.com/groups/g/posts/10161234567890123/", "https://www.facebook.com/groups/g/posts/x/"],
+    })
+    payloads = build_payloads(df, "2025-04-20 12:00:00", key="url")
+    assert [p["url"] for p in payloads] == df["URL"].tolist()
+    assert payloads[0]["post_id"] == "10161234567890123"
+    assert all("id_bai_viet" not in p for p in payloads)
+
+
+NOW = datetime(2025, 4, 20, 12, 30)
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("5 phút", "2025-04-20 12:25:00"),
+        ("3 ngày", "2025-04-17 12:30:00"),
+        ("11 giờ", "2025-04-20 01:30:00"),
+        ("11 giò", "2025-04-20 01:30:00"),
+        ("2 gio", "2025-04-20 10:30:00"),
+        ("Hôm qua", "2025-04-19 12:30:00"),
+        ("Hôm qua lúc 21:15", "2025-04-19 21:15:00"),
+        ("Hôm qua lúc 25:00", None),
+        ("18 tháng 4 lúc 09:24", "2025-04-18 09:24:00"),
+        ("5 tháng 1", "2025-01-05 00:00:00"),
+        ("19 tháng 11, 2024", "2024-11-19 00:00:00"),
+        ("19 tháng 11 2024", "2024-11-19 00:00:00"),
+        ("Người tham gia ẩn danh 5 tháng 1", "2025-01-05 00:00:00"),
+        ("31 tháng 2", None),
+        ("Vừa xong", None),
+        ("", None),
+    ],
+)
+def test_vietnamese_date_parser(text, expected):
+    from rpa_process_data import VietnameseDateParser, parse_vietnamese_date
+
+    parsed = VietnameseDateParser(NOW).parse(text)
+    assert (parsed.strftime("%Y-%m-%d %H:%M:%S") if parsed else None) == expected
+    assert parse_vietnamese_date(text, NOW) == expected
+
+
+def test_parse_vietnamese_dates_returns_datetime64_with_nat():
+    from rpa_process_data import parse_vietnamese_dates
+
+    values = pd.Series(["5 phút", "31 tháng 2", None, float("nan"), "5 phút", "Hôm qua lúc 08:05"], index=range(10, 16))
+    parsed = parse_vietnamese_dates(values, NOW)
+    assert str(parsed.dtype) == "datetime64[ns]"
+    assert list(parsed.index) == list(values.index)
+    assert parsed.isna().tolist() == [False, True, True, True, False, False]
+    assert parsed.iloc[0] == parsed.iloc[4] == pd.Timestamp("2025-04-20 12:25:00")
+    assert parsed.iloc[5] == pd.Timestamp("2025-04-19 08:05:00")
+
+
+def test_date_parser_uses_one_reference_time_and_ignores_non_strings():
+    from rpa_process_data import VietnameseDateParser
+
+    parser = VietnameseDateParser(NOW)
+    assert parser.parse("1 giờ") == parser.parse("1 giờ") == NOW - timedelta(hours=1)
+    assert parser.parse(None) is None
+    assert parser.parse(12) is None
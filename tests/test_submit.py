@@ -0,0 +1,66 @@
+"""LinkSubmitter gửi link lên ApiStubServer (benchmarks.common): chỉ link được nhận mới vào SeenIndex."""
+
+import pytest
+
+from benchmarks.common import ApiStubServer
+from rpa_api_client import ApiClient
+from rpa_seen_index import SeenIndex
+from rpa_submit import LinkSubmitter
+
+LINKS = [f"https://www.facebook.com/groups/g/posts/{i}/" for i in range(1, 6)]
+
+
+@pytest.fixture
+def seen_index(tmp_path):
+    index = SeenIndex(str(tmp_path / "seen.sqlite3"))
+    yield index
+    index.close()
+
+
+def submit(api, seen_index, links=LINKS, batch_size=5):
+    submitter = LinkSubmitter(
+        api.api_url, batch_size=batch_size, flush_interval=0.05, client=ApiClient(max_attempts=1), seen_index=seen_index
+    )
+    for link in links:
+        submitter.add(link)
+    submitter.close()
+    return submitter
+
+
+def test_bulk_success_records_every_link(seen_index):
+    with ApiStubServer() as api:
+        submitter = submit(api, seen_index)
+    assert (submitter.sent, submitter.failed) == (5, 0)
+    assert api.api_calls == 1
+    assert all(link in seen_index for link in LINKS)
+
+
+def test_rejected_links_are_not_recorded(seen_index):
+    with ApiStubServer(reject={LINKS[1], LINKS[3]}) as api:
+        submitter = submit(api, seen_index)
+    assert (submitter.sent, submitter.failed) == (3, 2)
+    assert [link in seen_index for link in LINKS] == [True, False, True, False, True]
+
+
+def test_links_without_result_are_not_recorded(seen_index):
+    with ApiStubServer(max_results=2) as api:
+        submitter = submit(api, seen_index)
+    assert (submitter.sent, submitter.failed) == (2, 3)
+    assert [link in seen_index for link in LINKS] == [True, True, False, False, False]
+
+
+def test_throttled_bulk_keeps_bulk_mode(seen_index):
+    with ApiStubServer(bulk_status=429) as api:
+        submitter = submit(api, seen_index, batch_size=1)
+    assert submitter.bulk
+    assert (submitter.sent, submitter.failed) == (0, 5)
+    assert len(seen_index) == 0
+    assert all("urls" in body for body in api.bodies)
+
+
+def test_old_server_falls_back_to_single_links(seen_index):
+    with ApiStubServer(bulk=False) as api:
+        submitter = submit(api, seen_index)
+    assert not submitter.bulk
+    assert (submitter.sent, submitter.failed) == (5, 0)
+    assert [body for body in api.bodies if "url" in body] == [{"url": link} for link in LINKS]
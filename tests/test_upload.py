@@ -0,0 +1,89 @@
+"""RowUploader cập nhật bài viết lên ApiStubServer (benchmarks.common) và ghi UploadIndex."""
+
+import pytest
+
+from benchmarks.common import ApiStubServer
+from rpa_api_client import ApiClient
+from rpa_upload import RowUploader
+from rpa_upload_index import UploadIndex
+
+ROWS = [{"id_bai_viet": 1000 + i, "like": i, "modified_time": "2025-04-20 12:00:00"} for i in range(6)]
+
+
+@pytest.fixture
+def upload_index(tmp_path):
+    index = UploadIndex(str(tmp_path / "uploaded.sqlite3"))
+    yield index
+    index.close()
+
+
+def upload(api, upload_index, rows=ROWS, retries=1, batch_size=3):
+    uploader = RowUploader(
+        api.api_url,
+        batch_size=batch_size,
+        workers=1,
+        retries=retries,
+        client=ApiClient(max_attempts=1),
+        upload_index=upload_index,
+    )
+    try:
+        return uploader, uploader.upload([dict(row) for row in rows])
+    finally:
+        uploader.close()
+
+
+def ids(rows):
+    return sorted(row["id_bai_viet"] for row in rows)
+
+
+def test_bulk_success(upload_index):
+    with ApiStubServer() as api:
+        uploader, report = upload(api, upload_index)
+    assert (report["updated"], report["failed"], report["batches"]) == (6, 0, 2)
+    assert uploader.bulk
+    assert len(api.bodies) == 2 and all(len(body["rows"]) == 3 for body in api.bodies)
+    assert upload_index.changed(ROWS) == []
+
+
+def test_falls_back_to_single_rows(upload_index):
+    with ApiStubServer(bulk=False) as api:
+        uploader, report = upload(api, upload_index)
+    assert not uploader.bulk
+    assert (report["updated"], report["failed"]) == (6, 0)
+    assert ids(body for body in api.bodies if "id_bai_viet" in body) == ids(ROWS)
+    assert upload_index.changed(ROWS) == []
+
+
+def test_rejected_items_are_failed_and_not_indexed(upload_index):
+    with ApiStubServer(reject={1001, 1004}) as api:
+        _, report = upload(api, upload_index, retries=0)
+    assert (report["updated"], report["failed"]) == (4, 2)
+    assert ids(report["failed_rows"]) == [1001, 1004]
+    assert ids(upload_index.changed(ROWS)) == [1001, 1004]
+
+
+def test_short_results_fail_unmatched_rows(upload_index):
+    with ApiStubServer(max_results=2) as api:
+        _, report = upload(api, upload_index, retries=0)
+    # Mỗi lô 3 dòng, server chỉ trả về 2 kết quả: dòng thứ 3 của mỗi lô là lỗi
+    assert (report["updated"], report["failed"]) == (4, 2)
+    assert ids(report["failed_rows"]) == [1002, 1005]
+    assert ids(upload_index.changed(ROWS)) == [1002, 1005]
+
+
+@pytest.mark.parametrize("retries", [0, 1, 3])
+def test_failed_rows_are_retried_retries_times(upload_index, retries):
+    with ApiStubServer(reject={1001}) as api:
+        _, report = upload(api, upload_index, retries=retries)
+    # Lượt đầu 2 lô, mỗi lượt thử lại gửi riêng dòng lỗi trong 1 lô
+    assert len(api.bodies) == 2 + retries
+    assert report["batches"] == 2 + retries
+    assert ids(report["failed_rows"]) == [1001]
+
+
+def test_unchanged_rows_are_skipped(upload_index):
+    with ApiStubServer() as api:
+        upload(api, upload_index)
+        _, report = upload(api, upload_index)
+    assert (report["unchanged"], report["updated"]) == (6, 0)
+    assert len(api.bodies) == 2